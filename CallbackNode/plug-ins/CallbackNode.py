@@ -5,6 +5,46 @@ Callback Node for dynamic update value without connections
 
 __MAYA_CALLBACK_FUNC__ | default is `__callback__`
 customize the callback function name 
+
+__MAYA_TRANSFER_FUNC__ | default is `__transfer__`
+customize the optional vectorized function name of the `transfer` sync mode
+it get all the input values (numpy array if numpy available) and return output values
+
+__MAYA_CALLBACK_CACHE_SIZE__ | default is `128`
+maximum compiled scripts kept in the process-wide code cache
+
+__MAYA_CALLBACK_WATCH__ | default is `1.0`
+seconds between file script modification sweeps, `0` disable hot reload
+
+__MAYA_CALLBACK_MAX_DEPTH__ | default is `16`
+maximum nested callback evaluation across every CallbackNode
+
+__MAYA_CALLBACK_MAX_RATE__ | default is `1000`
+maximum evaluation per second of a single group before it get suppressed
+
+__MAYA_CALLBACK_STATS__ | default is `0`
+enable the callback profiler on plug-in load, toggle it with `callbackNodeStats -e 1`
+(`true` / `on` / `false` / `off` are accepted as well)
+
+__MAYA_CALLBACK_STATS_SIZE__ | default is `4096`
+maximum profiler events kept in the ring buffer
+
+__MAYA_CALLBACK_MEMO_SIZE__ | default is `4096`
+maximum memoized frames kept by a single time group
+
+__MAYA_CALLBACK_WORKERS__ | default is `2`
+worker threads running the `__transfer__` function of the `async` sync mode
+
+__MAYA_CALLBACK_SYNC_FLUSH__ | default is empty
+`1` flush the deferred work synchronously (time change, before save / export, after load)
+`0` always rely on evalDeferred, empty enable it when Maya runs in batch mode
+(`true` / `on` / `false` / `off` are accepted, any other value detect batch mode)
+
+a number variable that could not be parsed warn and keep its default
+
+__MAYA_CALLBACK_CACHE_DIR__ | default is empty
+directory of the on-disk inline script bytecode cache, empty disable it
+pre-warm it from scenes with `python callback_node_cache.py scenes_dir/`
 """
 
 from __future__ import division
@@ -17,47 +57,87 @@ __date__ = "2021-11-20 21:49:35"
 
 import os
 import sys
-import ast
-import imp
+import time
+import json
+import heapq
+import hashlib
+import itertools
+import weakref
+import threading
+from collections import deque
 from collections import defaultdict
-from functools import partial
+from collections import OrderedDict
 from string import Template
+from types import ModuleType
 
 from maya import cmds
-from maya import OpenMaya
-from pymel.api import plugins
-from pymel import core as pm
+from maya.api import OpenMaya
+from maya.utils import executeDeferred
 
 import six
+import callback_node_cache
 
 
 PLUGIN_NAME = "CallbackNode"
+# NOTE the id pymel hashed from the node name, keep it so saved scenes still load
+PLUGIN_ID = OpenMaya.MTypeId(0x85C9C)
+
+
+def getenv_bool(name, default=None):
+    """
+    lenient boolean environment variable, warn and keep the default on unknown value
+    """
+    value = os.getenv(name) or ""
+    flag = value.strip().lower()
+    if flag in ("1", "true", "yes", "on"):
+        return True
+    elif flag in ("0", "false", "no", "off"):
+        return False
+    elif flag:
+        msg = "`%s` unknown value `%s`, use the default" % (name, value)
+        OpenMaya.MGlobal.displayWarning(msg)
+    return default
+
+
+def getenv_number(name, default, cast=int):
+    value = os.getenv(name) or ""
+    if not value.strip():
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        msg = "`%s` is not a number `%s`, use `%s`" % (name, value, default)
+        OpenMaya.MGlobal.displayWarning(msg)
+        return default
+
+
 CALLBACK_NAME = os.getenv("__MAYA_CALLBACK_FUNC__") or "__callback__"
+TRANSFER_NAME = os.getenv("__MAYA_TRANSFER_FUNC__") or "__transfer__"
+CACHE_SIZE = getenv_number("__MAYA_CALLBACK_CACHE_SIZE__", 128)
+WATCH_INTERVAL = getenv_number("__MAYA_CALLBACK_WATCH__", 1.0, float)
+MAX_DEPTH = getenv_number("__MAYA_CALLBACK_MAX_DEPTH__", 16)
+MAX_RATE = getenv_number("__MAYA_CALLBACK_MAX_RATE__", 1000)
+STATS = getenv_bool("__MAYA_CALLBACK_STATS__", False)
+STATS_SIZE = getenv_number("__MAYA_CALLBACK_STATS_SIZE__", 4096)
+MEMO_SIZE = getenv_number("__MAYA_CALLBACK_MEMO_SIZE__", 4096)
+WORKERS = getenv_number("__MAYA_CALLBACK_WORKERS__", 2)
+# NOTE None detect the batch mode
+SYNC_FLUSH = getenv_bool("__MAYA_CALLBACK_SYNC_FLUSH__")
 __file__ = globals().get("__file__")
 __file__ = __file__ or cmds.pluginInfo(PLUGIN_NAME, q=1, p=1)
 DIR = os.path.dirname(os.path.abspath(__file__))
-nestdict = lambda: defaultdict(nestdict)
+MODE_CALLBACK, MODE_TRANSFER, MODE_ASYNC, MODE_COMPUTE = range(4)
+timer = getattr(time, "perf_counter", time.time)
 
 
 class Util:
-    @staticmethod
-    def is_valid_python(code):
-        """
-        https://stackoverflow.com/a/11854793
-        """
-        try:
-            ast.parse(code)
-        except SyntaxError:
-            return False
-        return True
+    numpy = None
 
     @staticmethod
     def ignore_undo_deco(func):
         def wrapper(*args, **kwargs):
-            cmds.undoInfo(swf=0)
-            res = func(*args, **kwargs)
-            cmds.undoInfo(swf=1)
-            return res
+            with IGNORE_UNDO:
+                return func(*args, **kwargs)
 
         return wrapper
 
@@ -65,28 +145,1068 @@ class Util:
     def get_array_element(plugs):
         outputs = []
         for i in range(plugs.numConnectedElements()):
-            plug = plugs.elementByPhysicalIndex(i)
-            array = OpenMaya.MPlugArray()
-            plug.connectedTo(array, True, False)
-            outputs.append(array[0])
-            del array
+            plug = plugs.connectionByPhysicalIndex(i)
+            outputs.append(plug.source())
         return outputs
 
+    @staticmethod
+    def fingerprint(plugs):
+        """
+        tuple of the plug values, None when a plug could not be read as a number
+        NOTE keep the values themselves, float hash collide (`hash(-1.0) == hash(-2.0)`)
+        """
+        try:
+            return tuple(plug.asDouble() for plug in plugs)
+        except (RuntimeError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def write_plugs(plugs, values):
+        modifier = OpenMaya.MDGModifier()
+        for plug, value in zip(plugs, values):
+            modifier.newPlugValueDouble(plug, float(value))
+        with IGNORE_UNDO:
+            modifier.doIt()
+
+    @staticmethod
+    def as_array(values):
+        """
+        numpy array when numpy is available, otherwise keep the list
+        """
+        if Util.numpy is None:
+            try:
+                import numpy
+            except ImportError:
+                numpy = False
+            Util.numpy = numpy
+        return Util.numpy.asarray(values, dtype=float) if Util.numpy else values
+
+    @staticmethod
+    def resolve_path(script):
+        # NOTE code never contains a path, skip the file system lookup
+        if "\n" in script:
+            return ""
+        if "$" in script:
+            envs = {"__file__": __file__, "__dir__": DIR}
+            script = Template(script).substitute(os.environ, **envs)
+        path = os.path.abspath(script)
+        return path if os.path.isfile(path) else ""
+
+    @staticmethod
+    def stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    @staticmethod
+    def new_module(code, module_name, path="", owner=None):
+        module = ModuleType(module_name)
+        if path:
+            module.__file__ = path
+        six.exec_(code, module.__dict__)
+        MODULES.add(module, owner)
+        return module
+
+    @staticmethod
+    def hash_node(node):
+        return OpenMaya.MObjectHandle(node).hashCode()
+
+    @staticmethod
+    def hash_attributes(attr, parent=True):
+        """
+        hash the attribute with its children and parents
+        so that compound and child plug message both match
+        """
+        hashes = {Util.hash_node(attr)}
+        if attr.hasFn(OpenMaya.MFn.kCompoundAttribute):
+            compound = OpenMaya.MFnCompoundAttribute(attr)
+            for i in range(compound.numChildren()):
+                hashes |= Util.hash_attributes(compound.child(i), False)
+        if parent:
+            attr_parent = OpenMaya.MFnAttribute(attr).parent
+            while not attr_parent.isNull():
+                hashes.add(Util.hash_node(attr_parent))
+                attr_parent = OpenMaya.MFnAttribute(attr_parent).parent
+        return hashes
+
+
+class IgnoreUndo(object):
+    """
+    re-entrant undo suppression context
+    only the outermost level toggle the undo state and restore the previous one,
+    even if the callback raise
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.state = False
+
+    def __enter__(self):
+        if not self.depth:
+            self.state = cmds.undoInfo(q=1, swf=1)
+            if self.state:
+                cmds.undoInfo(swf=0)
+        self.depth += 1
+        return self
+
+    def __exit__(self, *args):
+        self.depth -= 1
+        if not self.depth and self.state:
+            cmds.undoInfo(swf=1)
+
+
+IGNORE_UNDO = IgnoreUndo()
+
+
+class ScriptCache(object):
+    """
+    process-wide compiled code cache shared by every CallbackNode
+    inline script keyed by source hash, file script keyed by path + mtime + size
+    inline script missing here fall back to the `callback_node_cache` disk cache
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.codes = OrderedDict()
+
+    def get(self, key):
+        code = self.codes.pop(key, None)
+        if code is not None:
+            self.codes[key] = code
+        return code
+
+    def put(self, key, code):
+        self.codes[key] = code
+        while len(self.codes) > self.size:
+            self.codes.popitem(last=False)
+
+    def clear(self):
+        self.codes.clear()
+
+    def load(self, script):
+        """
+        return `(code, path)`, code is None if the inline script is not valid
+        """
+        path = Util.resolve_path(script)
+        if path:
+            return self.load_file(path), path
+
+        key = hashlib.sha1(six.ensure_binary(script)).hexdigest()
+        code = self.get(key)
+        if code is None:
+            # NOTE consult the on-disk cache before compiling the source
+            try:
+                code = callback_node_cache.compile_source(script)
+            except SyntaxError:
+                return None, path
+            self.put(key, code)
+        return code, path
+
+    def load_file(self, path):
+        key = (path,) + Util.stat(path)
+        code = self.get(key)
+        if code is None:
+            with open(path, "rb") as f:
+                code = compile(f.read(), path, "exec")
+            self.put(key, code)
+        return code
+
+
+SCRIPT_CACHE = ScriptCache()
+
+
+class FileWatcher(object):
+    """
+    track every file script referenced by any CallbackNode, stat them in one
+    timer sweep and swap the recompiled module into every slot using the file
+    """
+
+    def __init__(self, interval=WATCH_INTERVAL):
+        self.interval = interval
+        # NOTE path -> {(node, group attribute, index): (cache, module name)}
+        self.paths = defaultdict(dict)
+        self.slots = {}
+        self.stats = {}
+        self.callback_id = None
+
+    def watch(self, path, key, cache, module_name):
+        self.unwatch(key)
+        self.paths[path][key] = (cache, module_name)
+        self.slots[key] = path
+        self.stats.setdefault(path, Util.stat(path))
+        if self.callback_id is None and self.interval > 0:
+            self.callback_id = OpenMaya.MTimerMessage.addTimerCallback(
+                self.interval, self.sweep
+            )
+
+    def unwatch(self, key):
+        path = self.slots.pop(key, None)
+        if path is None:
+            return
+        slots = self.paths[path]
+        slots.pop(key, None)
+        if not slots:
+            self.paths.pop(path, None)
+            self.stats.pop(path, None)
+        if not self.paths:
+            self.stop()
+
+    def unwatch_node(self, node):
+        for key in [key for key in self.slots if key[0] is node]:
+            self.unwatch(key)
+
+    def stop(self):
+        if self.callback_id is not None:
+            OpenMaya.MMessage.removeCallback(self.callback_id)
+            self.callback_id = None
+
+    def sweep(self, *args):
+        for path, slots in list(self.paths.items()):
+            stat = Util.stat(path)
+            if stat is None or stat == self.stats.get(path):
+                continue
+            self.stats[path] = stat
+
+            # NOTE compile the changed file exactly once for every slot
+            try:
+                code = SCRIPT_CACHE.load_file(path)
+            except SyntaxError as e:
+                OpenMaya.MGlobal.displayWarning("`%s` reload failed: %s" % (path, e))
+                continue
+            for (node, attr, index), (cache, module_name) in list(slots.items()):
+                if node.is_alive():
+                    cache[index] = Util.new_module(code, module_name, path, node)
+                    node.on_script_reloaded(attr, index)
+
+
+WATCHER = FileWatcher()
+
+
+class ModuleRegistry(object):
+    """
+    weak registry of every callback module alive in the session
+    a module is listed only while a cache (or a leaked reference) still hold it
+    """
+
+    def __init__(self):
+        self.modules = weakref.WeakValueDictionary()
+        self.owners = weakref.WeakValueDictionary()
+
+    def add(self, module, owner=None):
+        name = module.__name__
+        self.modules[name] = module
+        if owner is not None:
+            self.owners[name] = owner
+
+    def report(self):
+        """
+        live modules grouped by node, `node` is None when the owner is gone
+        """
+        nodes = OrderedDict()
+        for name in sorted(self.modules.keys()):
+            owner = self.owners.get(name)
+            alive = owner is not None and owner.handle and owner.handle.isValid()
+            nodes.setdefault(owner.name() if alive else None, []).append(name)
+        return [
+            {"node": node, "count": len(modules), "modules": modules}
+            for node, modules in nodes.items()
+        ]
+
+
+MODULES = ModuleRegistry()
+
+
+def cache_report():
+    """
+    live cached callback modules per CallbackNode
+    """
+    return MODULES.report()
+
+
+class DeferredScheduler(object):
+    """
+    collect dirty `(node, group index)` pairs during a DG burst
+    and flush them in a single deferred pass ordered by dependency
+    """
+
+    def __init__(self):
+        self.pending = OrderedDict()
+        self.is_scheduled = False
+        self.is_flushing = False
+
+    def schedule(self, node, index, call_type):
+        # NOTE deferred callback changes should not schedule another pass
+        if self.is_flushing:
+            return
+        key = (node, index)
+        if key not in self.pending or call_type != "eval":
+            self.pending[key] = call_type
+        if not self.is_scheduled:
+            self.is_scheduled = True
+            cmds.evalDeferred(self.flush)
+
+    def flush(self):
+        self.is_scheduled = False
+        pending, self.pending = self.pending, OrderedDict()
+        self.is_flushing = True
+        try:
+            # NOTE one undo state toggle for the whole batch
+            with IGNORE_UNDO:
+                for node, index in self.sort(list(pending)):
+                    # NOTE exists check so that delete will perform correctly
+                    if node.is_alive():
+                        node.eval_sync_deferred(index, pending[(node, index)])
+        finally:
+            self.is_flushing = False
+
+    @staticmethod
+    def sort(keys):
+        """
+        group driving a node read by another group runs first,
+        otherwise (and inside cycles) keep the dirty order
+        """
+        if len(keys) < 2:
+            return keys
+
+        position = {key: i for i, key in enumerate(keys)}
+        drivers = defaultdict(set)
+        for key in keys:
+            node, index = key
+            for plug in node.sync_plugs.get(index, (None, [], []))[2]:
+                drivers[Util.hash_node(plug.node())].add(key)
+
+        children = defaultdict(set)
+        degree = dict.fromkeys(keys, 0)
+        for key in keys:
+            node, index = key
+            for plug in node.sync_plugs.get(index, (None, [], []))[1]:
+                for parent in drivers.get(Util.hash_node(plug.node()), ()):
+                    if parent != key and key not in children[parent]:
+                        children[parent].add(key)
+                        degree[key] += 1
+
+        ready = [position[key] for key in keys if not degree[key]]
+        heapq.heapify(ready)
+        ordered = []
+        done = set()
+        while len(ordered) < len(keys):
+            if not ready:
+                # NOTE dependency cycle, release the earliest dirtied group
+                rest = min(position[key] for key in keys if key not in done)
+                heapq.heappush(ready, rest)
+            key = keys[heapq.heappop(ready)]
+            if key in done:
+                continue
+            done.add(key)
+            ordered.append(key)
+            for child in children[key]:
+                degree[child] -= 1
+                if not degree[child] and child not in done:
+                    heapq.heappush(ready, position[child])
+        return ordered
+
+
+SCHEDULER = DeferredScheduler()
+
+
+class EvalGuard(object):
+    """
+    track the active `(node, group)` evaluation stack across every CallbackNode
+    suppress recursive, too deep or too frequent evaluation and report the path
+    """
+
+    def __init__(self, max_depth=MAX_DEPTH, max_rate=MAX_RATE):
+        self.max_depth = max_depth
+        self.max_rate = max_rate
+        self.stack = []
+        self.active = set()
+        # NOTE key -> call count within the current second only
+        self.rates = {}
+        self.second = None
+        self.reported = set()
+
+    def enter(self, node, attr, index):
+        key = (node, attr, index)
+        if key in self.active:
+            cycle = self.stack[self.stack.index(key) :] + [key]
+            return self.report(key, "callback cycle detected", cycle)
+        if len(self.stack) >= self.max_depth:
+            msg = "callback depth exceed %s" % self.max_depth
+            return self.report(key, msg, self.stack + [key])
+
+        second = int(time.time())
+        if second != self.second:
+            # NOTE every window belong to a past second, nothing worth keeping
+            self.rates.clear()
+            self.second = second
+        count = self.rates[key] = self.rates.get(key, 0) + 1
+        if count > self.max_rate:
+            msg = "callback rate exceed %s per second" % self.max_rate
+            return self.report(key, msg, [key])
+
+        self.stack.append(key)
+        self.active.add(key)
+        return True
+
+    def exit(self):
+        self.active.discard(self.stack.pop())
+        if not self.stack:
+            self.reported.clear()
+
+    def forget(self, node):
+        for key in [key for key in self.rates if key[0] is node]:
+            del self.rates[key]
+
+    def report(self, key, msg, path):
+        # NOTE warn once until the outermost evaluation finished
+        if (key, msg) not in self.reported:
+            self.reported.add((key, msg))
+            path = " -> ".join("%s.%s[%s]" % (n.name(), a, i) for n, a, i in path)
+            OpenMaya.MGlobal.displayWarning("%s: %s" % (msg, path))
+        return False
+
+
+GUARD = EvalGuard()
+
+
+class Profiler(object):
+    """
+    per node / per group callback statistic and a ring buffer of raw events
+    caller check `enabled` before timing so that it cost nothing when off,
+    skipped evaluations are always counted
+    """
+
+    def __init__(self, enabled=STATS, size=STATS_SIZE):
+        self.enabled = enabled
+        self.events = deque(maxlen=size)
+        self.stats = {}
+
+    def enable(self, enabled=True):
+        self.enabled = bool(enabled)
+
+    def reset(self):
+        self.events.clear()
+        self.stats.clear()
+
+    def record(self, start, node, attr, index, field="eval"):
+        """
+        field could be `eval` | `deferred` | `listen` | `select` | `time` | `compute` | `compile`
+        """
+        elapsed = timer() - start
+        name = node.name()
+        self.events.append((time.time(), name, attr, index, field, elapsed))
+
+        stat = self.get_stat(name, attr, index)
+        if field == "compile":
+            stat["compile"] += elapsed
+            return
+        if field == "deferred":
+            stat["deferred"] += 1
+        stat["count"] += 1
+        stat["total"] += elapsed
+        stat["max"] = max(stat["max"], elapsed)
+
+    def get_stat(self, name, attr, index):
+        key = (name, attr, index)
+        stat = self.stats.get(key)
+        if stat is None:
+            fields = ("count", "deferred", "skipped", "settled")
+            stat = self.stats[key] = dict.fromkeys(fields, 0)
+            stat.update(dict.fromkeys(("total", "max", "compile"), 0.0))
+        return stat
+
+    def skip(self, node, attr, index, field="skipped"):
+        """
+        `skipped` count redundant dirties, `settled` the deferred pass finding
+        the values its dirty run already applied
+        """
+        self.get_stat(node.name(), attr, index)[field] += 1
+
+    def report(self):
+        """
+        statistic sorted by the cumulative wall time
+        """
+        report = []
+        for (name, attr, index), stat in self.stats.items():
+            item = {"node": name, "group": attr, "index": index}
+            item.update(stat)
+            report.append(item)
+        return sorted(report, key=lambda item: item["total"], reverse=True)
+
+
+PROFILER = Profiler()
+
+
+class SceneLoader(object):
+    """
+    defer CallbackNode initialization while Maya reads a file or a reference
+    and rebuild every touched node in a single pass after loading
+    """
+
+    BEFORE = (
+        "kBeforeOpen",
+        "kBeforeImport",
+        "kBeforeCreateReference",
+        "kBeforeLoadReference",
+        "kBeforeImportReference",
+    )
+    AFTER = (
+        "kAfterOpen",
+        "kAfterImport",
+        "kAfterCreateReference",
+        "kAfterLoadReference",
+        "kAfterImportReference",
+    )
+
+    def __init__(self):
+        self.depth = 0
+        self.pending = OrderedDict()
+        self.callback_ids = []
+
+    @property
+    def is_loading(self):
+        return self.depth > 0
+
+    def register(self):
+        addCallback = OpenMaya.MSceneMessage.addCallback
+        for msg in self.BEFORE:
+            msg = getattr(OpenMaya.MSceneMessage, msg)
+            self.callback_ids.append(addCallback(msg, self.begin))
+        for msg in self.AFTER:
+            msg = getattr(OpenMaya.MSceneMessage, msg)
+            self.callback_ids.append(addCallback(msg, self.end))
+        # NOTE recover from a failed file read which never send the after message
+        msg = OpenMaya.MSceneMessage.kAfterNew
+        self.callback_ids.append(addCallback(msg, self.reset))
+
+    def deregister(self):
+        OpenMaya.MMessage.removeCallbacks(self.callback_ids)
+        self.callback_ids = []
+
+    def begin(self, *args):
+        self.depth += 1
+
+    def end(self, *args):
+        self.depth = max(self.depth - 1, 0)
+        if not self.depth:
+            self.flush()
+
+    def reset(self, *args):
+        self.depth = 0
+        self.flush()
+
+    def defer(self, node):
+        self.pending[node] = None
+
+    def flush(self):
+        pending, self.pending = self.pending, OrderedDict()
+        for node in pending:
+            if node.is_alive():
+                node.rebuild()
+        if POLICY.synchronous:
+            flush()
+
+
+LOADER = SceneLoader()
+
+
+class NodeTracker(object):
+    """
+    suspend a removed CallbackNode and resume it when undo / redo add it back
+    callback ids and cached modules are kept until the node is destroyed
+    """
+
+    def __init__(self):
+        self.callback_ids = []
+
+    def register(self):
+        self.callback_ids = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self.on_added, PLUGIN_NAME),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.on_removed, PLUGIN_NAME),
+        ]
+
+    def deregister(self):
+        OpenMaya.MMessage.removeCallbacks(self.callback_ids)
+        self.callback_ids = []
+
+    @staticmethod
+    def get_node(mobject):
+        node = OpenMaya.MFnDependencyNode(mobject).userNode()
+        return node if isinstance(node, CallbackNodeBase) else None
+
+    def on_added(self, mobject, *args):
+        node = self.get_node(mobject)
+        if node:
+            node.resume()
+
+    def on_removed(self, mobject, *args):
+        node = self.get_node(mobject)
+        if node:
+            node.suspend()
+
+
+TRACKER = NodeTracker()
+
+
+class SelectionDispatcher(object):
+    """
+    one `SelectionChanged` callback for the whole plug-in
+    the selection delta is computed once per event and only routed to
+    the select groups watching a node which entered or left the selection
+    """
+
+    def __init__(self):
+        self.callback_id = None
+        # NOTE watched node hash -> MObjectHandle / {(CallbackNode, group index)}
+        self.handles = {}
+        self.routes = defaultdict(set)
+        # NOTE (CallbackNode, group index) -> watched / reported as selected node hashes
+        self.watched = defaultdict(set)
+        self.reported = defaultdict(set)
+        self.selection = set()
+        self.pending = OrderedDict()
+        self.is_scheduled = False
+
+    def add(self, node, index, mobject):
+        key = Util.hash_node(mobject)
+        self.handles[key] = OpenMaya.MObjectHandle(mobject)
+        self.routes[key].add((node, index))
+        self.watched[(node, index)].add(key)
+        if self.callback_id is None:
+            self.selection = self.get_selection()
+            self.callback_id = OpenMaya.MEventMessage.addEventCallback(
+                "SelectionChanged", self.on_selection_changed
+            )
+        if key in self.selection:
+            self.reported[(node, index)].add(key)
+
+    def remove(self, node, index, mobject):
+        self.discard(Util.hash_node(mobject), (node, index))
+
+    def remove_group(self, node, index):
+        route = (node, index)
+        for key in list(self.watched.get(route, ())):
+            self.discard(key, route)
+
+    def remove_node(self, node):
+        for route in [route for route in self.watched if route[0] is node]:
+            self.remove_group(*route)
+
+    def discard(self, key, route):
+        routes = self.routes.get(key)
+        if routes is None or route not in routes:
+            return
+        routes.discard(route)
+        for table in (self.watched, self.reported):
+            table[route].discard(key)
+            if not table[route]:
+                table.pop(route)
+        if not routes:
+            self.routes.pop(key)
+            self.handles.pop(key, None)
+        if not self.routes:
+            self.stop()
+
+    def stop(self):
+        if self.callback_id is not None:
+            OpenMaya.MMessage.removeCallback(self.callback_id)
+        self.callback_id = None
+        self.selection = set()
+        self.pending.clear()
+
+    @staticmethod
+    def get_selection():
+        selection = OpenMaya.MGlobal.getActiveSelectionList()
+        return {
+            Util.hash_node(selection.getDependNode(i)) for i in range(selection.length())
+        }
+
+    def on_selection_changed(self, *args):
+        selection = self.get_selection()
+        delta = selection ^ self.selection
+        self.selection = selection
+
+        routes = OrderedDict()
+        for key in delta:
+            for route in self.routes.get(key, ()):
+                routes[route] = None
+
+        for route in routes:
+            node, index = route
+            if not node.is_alive():
+                continue
+            # NOTE throttled group get the settled selection once per idle (marquee drag)
+            if node.is_select_throttled(index):
+                self.pending[route] = None
+                if not self.is_scheduled:
+                    self.is_scheduled = True
+                    cmds.evalDeferred(self.flush)
+                continue
+            self.dispatch(route)
+
+    def flush(self):
+        self.is_scheduled = False
+        pending, self.pending = self.pending, OrderedDict()
+        for route in pending:
+            if route[0].is_alive():
+                self.dispatch(route)
+
+    def dispatch(self, route):
+        node, index = route
+        current = self.watched.get(route, set()) & self.selection
+        reported = self.reported.pop(route, set())
+        selected = [self.handles[key].object() for key in current - reported]
+        deselected = [self.handles[key].object() for key in reported - current]
+        if current:
+            self.reported[route] = current
+        if selected or deselected:
+            node.on_select_changed(index, selected, deselected)
+
+
+SELECTION = SelectionDispatcher()
+
+
+class ListenDispatcher(object):
+    """
+    one attribute changed callback per listened node for the whole plug-in
+    events fan out to the subscribed listen groups through a prebuilt routing table,
+    the Maya callback is removed with the last subscriber
+    """
+
+    def __init__(self):
+        # NOTE listened node hash -> callback id / {(CallbackNode, group index): ListenFilter}
+        self.callback_ids = {}
+        self.routes = defaultdict(OrderedDict)
+        self.tables = {}
+
+    def add(self, node, index, listener):
+        mobject = listener.plug.node()
+        key = Util.hash_node(mobject)
+        self.routes[key][(node, index)] = listener
+        self.tables[key] = tuple(self.routes[key].items())
+        if key not in self.callback_ids:
+            addAttributeChangedCallback = OpenMaya.MNodeMessage.addAttributeChangedCallback
+            callback_id = addAttributeChangedCallback(mobject, self.on_attr_changed, key)
+            self.callback_ids[key] = callback_id
+
+    def remove(self, node, index, key):
+        routes = self.routes.get(key)
+        if routes is None or routes.pop((node, index), None) is None:
+            return
+        if routes:
+            self.tables[key] = tuple(routes.items())
+            return
+        del self.routes[key]
+        del self.tables[key]
+        OpenMaya.MMessage.removeCallback(self.callback_ids.pop(key))
+
+    def stop(self):
+        OpenMaya.MMessage.removeCallbacks(list(self.callback_ids.values()))
+        self.callback_ids.clear()
+        self.routes.clear()
+        self.tables.clear()
+
+    def on_attr_changed(self, msg, plug, other_plug, key):
+        for (node, _), listener in self.tables.get(key, ()):
+            node.on_listen_attr_changed(msg, plug, other_plug, listener)
+
+
+LISTENER = ListenDispatcher()
+
+
+class TimeDispatcher(object):
+    """
+    one time change callback for every CallbackNode with a time group
+    """
+
+    def __init__(self):
+        self.callback_id = None
+        self.nodes = OrderedDict()
+
+    def start(self):
+        if self.callback_id is None:
+            addTimeChangeCallback = OpenMaya.MDGMessage.addTimeChangeCallback
+            self.callback_id = addTimeChangeCallback(self.on_time_changed)
+
+    def add(self, node):
+        self.nodes[node] = None
+        self.start()
+
+    def remove(self, node):
+        self.nodes.pop(node, None)
+        # NOTE synchronous flush keep the callback to settle every frame
+        if not self.nodes and not POLICY.synchronous:
+            self.stop()
+
+    def stop(self):
+        if self.callback_id is not None:
+            OpenMaya.MMessage.removeCallback(self.callback_id)
+        self.callback_id = None
+        self.nodes.clear()
+
+    def on_time_changed(self, time, *args):
+        frame = time.value
+        for node in list(self.nodes):
+            if node.is_alive():
+                node.on_time_changed(frame)
+        # NOTE time groups wrote the new frame, settle it before the next frame
+        if POLICY.synchronous:
+            flush()
+
+
+TIME = TimeDispatcher()
+
+
+class AsyncRunner(object):
+    """
+    bounded worker threads for the `async` sync mode
+    input values are read on the main thread, only the latest job of a group is kept
+    and a result is written back on the main thread only if no newer job was submitted
+    """
+
+    def __init__(self, size=WORKERS):
+        self.size = max(size, 1)
+        self.lock = threading.Condition()
+        self.workers = 0
+        # NOTE (CallbackNode, group index) -> latest job / generation counter
+        self.jobs = OrderedDict()
+        self.generations = defaultdict(int)
+        self.results = deque()
+        self.is_scheduled = False
+
+    @property
+    def is_busy(self):
+        return bool(self.jobs or self.workers or self.results)
+
+    def submit(self, node, index, func, inputs, outputs):
+        key = (node, index)
+        values = [plug.asDouble() for plug in inputs]
+        with self.lock:
+            self.generations[key] += 1
+            # NOTE superseded job not started yet is dropped here
+            self.jobs.pop(key, None)
+            self.jobs[key] = (self.generations[key], func, values, outputs)
+            # NOTE nothing keep the UI busy in batch, run it right away
+            if POLICY.synchronous:
+                start = False
+            elif self.workers < self.size:
+                self.workers += 1
+                start = True
+            else:
+                return
+        if not start:
+            return self.flush()
+        thread = threading.Thread(target=self.work, name="CallbackNodeWorker")
+        thread.daemon = True
+        thread.start()
+
+    def work(self):
+        while True:
+            with self.lock:
+                if not self.jobs:
+                    self.workers -= 1
+                    self.lock.notify_all()
+                    return
+                key, job = self.jobs.popitem(last=False)
+            self.run(key, *job)
+
+    def run(self, key, generation, func, values, outputs):
+        try:
+            result, error = func(Util.as_array(values)), None
+        except Exception as e:
+            result, error = None, e
+        with self.lock:
+            self.results.append((key, generation, outputs, result, error))
+            if self.is_scheduled:
+                return
+            self.is_scheduled = True
+        executeDeferred(self.apply)
+
+    def apply(self):
+        with self.lock:
+            self.is_scheduled = False
+            results, self.results = self.results, deque()
+        for key, generation, outputs, result, error in results:
+            node, index = key
+            # NOTE stale result, a newer job has been submitted
+            if generation != self.generations.get(key) or not node.is_alive():
+                continue
+            if error is not None:
+                name = "%s.sync_group[%s]" % (node.name(), index)
+                OpenMaya.MGlobal.displayWarning("`%s` async error: %s" % (name, error))
+                continue
+            Util.write_plugs(outputs, result)
+
+    def flush(self):
+        """
+        run the queued jobs on the calling thread, wait for the workers
+        and write every result now
+        """
+        while True:
+            with self.lock:
+                if not self.jobs:
+                    break
+                key, job = self.jobs.popitem(last=False)
+            self.run(key, *job)
+        with self.lock:
+            while self.workers:
+                self.lock.wait()
+        self.apply()
+
+    def cancel(self, node):
+        with self.lock:
+            for key in [key for key in self.generations if key[0] is node]:
+                self.jobs.pop(key, None)
+                del self.generations[key]
+
+    def stop(self):
+        with self.lock:
+            self.jobs.clear()
+            self.generations.clear()
+            self.results.clear()
+
+
+RUNNER = AsyncRunner()
+
+
+class FlushPolicy(object):
+    """
+    mayapy / batch never idle so that evalDeferred work may never run,
+    when synchronous the deferred work is flushed on time change,
+    before save / export and after load
+    NOTE the time change flush is owned by TIME so that it run once after the time groups
+    """
+
+    MESSAGES = ("kBeforeSave", "kBeforeExport")
+
+    def __init__(self):
+        self.synchronous = False
+        self.callback_ids = []
+
+    def register(self):
+        self.synchronous = self.detect()
+        if not self.synchronous:
+            return
+        addCallback = OpenMaya.MSceneMessage.addCallback
+        for msg in self.MESSAGES:
+            msg = getattr(OpenMaya.MSceneMessage, msg)
+            self.callback_ids.append(addCallback(msg, self.on_flush))
+        TIME.start()
+
+    def deregister(self):
+        OpenMaya.MMessage.removeCallbacks(self.callback_ids)
+        self.callback_ids = []
+
+    @staticmethod
+    def detect():
+        if SYNC_FLUSH is not None:
+            return SYNC_FLUSH
+        return bool(cmds.about(batch=1))
+
+    def on_flush(self, *args):
+        flush()
+
+
+POLICY = FlushPolicy()
+
+
+def flush():
+    """
+    run every pending deferred evaluation, throttled selection and async result now
+    """
+    # NOTE re-entered from a callback of the flushed pass
+    if SCHEDULER.is_flushing:
+        return
+    # NOTE a flushed pass could queue more work (async outputs dirty other groups)
+    for _ in range(MAX_DEPTH):
+        if not (SCHEDULER.pending or SELECTION.pending or RUNNER.is_busy):
+            return
+        SCHEDULER.flush()
+        SELECTION.flush()
+        RUNNER.flush()
+
+
+class CallbackNodeStats(OpenMaya.MPxCommand):
+    """
+    callbackNodeStats [-enable bool] [-reset] [-events] [-cache]
+    return the profiler report (raw events or live cached modules) as json string
+    """
+
+    name = "callbackNodeStats"
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    @staticmethod
+    def syntax():
+        syntax = OpenMaya.MSyntax()
+        syntax.addFlag("-e", "-enable", OpenMaya.MSyntax.kBoolean)
+        syntax.addFlag("-r", "-reset")
+        syntax.addFlag("-ev", "-events")
+        syntax.addFlag("-c", "-cache")
+        return syntax
+
+    def doIt(self, args):
+        parser = OpenMaya.MArgParser(self.syntax(), args)
+        if parser.isFlagSet("-e"):
+            PROFILER.enable(parser.flagArgumentBool("-e", 0))
+        if parser.isFlagSet("-r"):
+            PROFILER.reset()
+        if parser.isFlagSet("-c"):
+            result = cache_report()
+        elif parser.isFlagSet("-ev"):
+            result = list(PROFILER.events)
+        else:
+            result = PROFILER.report()
+        self.setResult(json.dumps(result))
+
+
+def maya_useNewAPI():
+    """
+    https://help.autodesk.com/view/MAYAUL/2022/ENU/?guid=Maya_SDK_Maya_Python_API_Using_the_Maya_Python_API_html
+    """
+
 
-class CallbackNodeBase(plugins.DependNode):
+class CallbackNodeBase(OpenMaya.MPxNode):
 
     enable = OpenMaya.MObject()
+    mode = OpenMaya.MObject()
     script = OpenMaya.MObject()
     inputs = OpenMaya.MObject()
     outputs = OpenMaya.MObject()
+    input_values = OpenMaya.MObject()
+    output_values = OpenMaya.MObject()
+    skip_unchanged = OpenMaya.MObject()
     sync_group = OpenMaya.MObject()
 
     listen_label = OpenMaya.MObject()
     listen_enable = OpenMaya.MObject()
     listen_script = OpenMaya.MObject()
     listen_inputs = OpenMaya.MObject()
+    listen_filter = OpenMaya.MObject()
+    listen_mask = OpenMaya.MObject()
     listen_group = OpenMaya.MObject()
 
+    select_label = OpenMaya.MObject()
+    select_enable = OpenMaya.MObject()
+    select_script = OpenMaya.MObject()
+    select_inputs = OpenMaya.MObject()
+    select_throttle = OpenMaya.MObject()
+    select_group = OpenMaya.MObject()
+
+    time_label = OpenMaya.MObject()
+    time_enable = OpenMaya.MObject()
+    time_script = OpenMaya.MObject()
+    time_inputs = OpenMaya.MObject()
+    time_outputs = OpenMaya.MObject()
+    time_memo = OpenMaya.MObject()
+    time_group = OpenMaya.MObject()
+
+    counter = itertools.count(1)
+
     @classmethod
     def initialize(cls):
 
@@ -94,123 +1214,449 @@ class CallbackNodeBase(plugins.DependNode):
         msgAttr = OpenMaya.MFnMessageAttribute()
         cAttr = OpenMaya.MFnCompoundAttribute()
         tAttr = OpenMaya.MFnTypedAttribute()
+        nAttr = OpenMaya.MFnNumericAttribute()
         kString = OpenMaya.MFnData.kString
+        kInt = OpenMaya.MFnNumericData.kInt
+        kBoolean = OpenMaya.MFnNumericData.kBoolean
         cls.enable = eAttr.create("enable", "e", 1)
         eAttr.addField("off", 0)
         eAttr.addField("on", 1)
-        eAttr.setKeyable(1)
-        eAttr.setWritable(1)
+        eAttr.keyable = True
+        eAttr.writable = True
 
         cls.script = tAttr.create("script", "s", kString)
-        tAttr.setWritable(1)
+        tAttr.writable = True
 
         cls.inputs = msgAttr.create("inputs", "i")
-        msgAttr.setArray(1)
-        msgAttr.setWritable(1)
-        msgAttr.setStorable(1)
+        msgAttr.array = True
+        msgAttr.writable = True
+        msgAttr.storable = True
 
         cls.outputs = msgAttr.create("outputs", "o")
-        msgAttr.setArray(1)
-        msgAttr.setWritable(1)
-        msgAttr.setStorable(1)
+        msgAttr.array = True
+        msgAttr.writable = True
+        msgAttr.storable = True
+
+        # NOTE transfer copy inputs to outputs by index without python callback
+        cls.mode = eAttr.create("mode", "m", MODE_CALLBACK)
+        eAttr.addField("callback", MODE_CALLBACK)
+        eAttr.addField("transfer", MODE_TRANSFER)
+        # NOTE async run the transfer function on a worker thread
+        eAttr.addField("async", MODE_ASYNC)
+        # NOTE compute run the transfer function from `input_values` to `output_values`
+        eAttr.addField("compute", MODE_COMPUTE)
+        eAttr.writable = True
+
+        kDouble = OpenMaya.MFnNumericData.kDouble
+        cls.input_values = nAttr.create("input_values", "iv", kDouble, 0.0)
+        nAttr.array = True
+        nAttr.keyable = True
+        nAttr.writable = True
+        nAttr.storable = True
+
+        cls.output_values = nAttr.create("output_values", "ov", kDouble, 0.0)
+        nAttr.array = True
+        nAttr.writable = False
+        nAttr.storable = False
+        # NOTE array size set by compute, do not pre-allocate the elements
+        nAttr.usesArrayDataBuilder = True
+
+        # NOTE skip the evaluation when the input values are the same as the last run
+        cls.skip_unchanged = nAttr.create("skip_unchanged", "su", kBoolean, False)
+        nAttr.writable = True
 
         cls.sync_group = cAttr.create("sync_group", "sg")
         cAttr.addChild(cls.enable)
         cAttr.addChild(cls.script)
         cAttr.addChild(cls.inputs)
         cAttr.addChild(cls.outputs)
-        cAttr.setArray(1)
+        cAttr.addChild(cls.mode)
+        cAttr.addChild(cls.skip_unchanged)
+        cAttr.addChild(cls.input_values)
+        cAttr.addChild(cls.output_values)
+        cAttr.array = True
 
         # -----------------------------------------------------------
 
         cls.listen_label = tAttr.create("listen_label", "ll", kString)
-        tAttr.setWritable(1)
+        tAttr.writable = True
 
         cls.listen_enable = eAttr.create("listen_enable", "le", 1)
         eAttr.addField("off", 0)
         eAttr.addField("on", 1)
-        eAttr.setKeyable(1)
-        eAttr.setWritable(1)
+        eAttr.keyable = True
+        eAttr.writable = True
 
         cls.listen_script = tAttr.create("listen_script", "ls", kString)
-        tAttr.setWritable(1)
+        tAttr.writable = True
 
         cls.listen_inputs = msgAttr.create("listen_inputs", "li")
-        msgAttr.setArray(1)
-        msgAttr.setWritable(1)
-        msgAttr.setStorable(1)
+        msgAttr.array = True
+        msgAttr.writable = True
+        msgAttr.storable = True
+
+        # NOTE space separated attribute names, empty use the connected plug
+        cls.listen_filter = tAttr.create("listen_filter", "lf", kString)
+        tAttr.writable = True
+
+        # NOTE MNodeMessage.AttributeMessage bit mask, 0 accept every message
+        cls.listen_mask = nAttr.create("listen_mask", "lm", kInt, 0)
+        nAttr.writable = True
 
         cls.listen_group = cAttr.create("listen_group", "lg")
         cAttr.addChild(cls.listen_label)
         cAttr.addChild(cls.listen_enable)
         cAttr.addChild(cls.listen_script)
         cAttr.addChild(cls.listen_inputs)
-        cAttr.setArray(1)
+        cAttr.addChild(cls.listen_filter)
+        cAttr.addChild(cls.listen_mask)
+        cAttr.array = True
+
+        # -----------------------------------------------------------
+
+        cls.select_label = tAttr.create("select_label", "sl", kString)
+        tAttr.writable = True
+
+        cls.select_enable = eAttr.create("select_enable", "se", 1)
+        eAttr.addField("off", 0)
+        eAttr.addField("on", 1)
+        eAttr.keyable = True
+        eAttr.writable = True
+
+        cls.select_script = tAttr.create("select_script", "ss", kString)
+        tAttr.writable = True
+
+        cls.select_inputs = msgAttr.create("select_inputs", "si")
+        msgAttr.array = True
+        msgAttr.writable = True
+        msgAttr.storable = True
+
+        # NOTE dispatch the settled selection once per idle instead of every event
+        cls.select_throttle = nAttr.create("select_throttle", "st", kBoolean, False)
+        nAttr.writable = True
+
+        cls.select_group = cAttr.create("select_group", "slg")
+        cAttr.addChild(cls.select_label)
+        cAttr.addChild(cls.select_enable)
+        cAttr.addChild(cls.select_script)
+        cAttr.addChild(cls.select_inputs)
+        cAttr.addChild(cls.select_throttle)
+        cAttr.array = True
+
+        # -----------------------------------------------------------
+
+        cls.time_label = tAttr.create("time_label", "tl", kString)
+        tAttr.writable = True
+
+        cls.time_enable = eAttr.create("time_enable", "te", 1)
+        eAttr.addField("off", 0)
+        eAttr.addField("on", 1)
+        eAttr.keyable = True
+        eAttr.writable = True
+
+        cls.time_script = tAttr.create("time_script", "ts", kString)
+        tAttr.writable = True
+
+        cls.time_inputs = msgAttr.create("time_inputs", "ti")
+        msgAttr.array = True
+        msgAttr.writable = True
+        msgAttr.storable = True
+
+        cls.time_outputs = msgAttr.create("time_outputs", "to")
+        msgAttr.array = True
+        msgAttr.writable = True
+        msgAttr.storable = True
+
+        # NOTE reuse the outputs computed for the same frame and input values
+        cls.time_memo = nAttr.create("time_memo", "tm", kBoolean, False)
+        nAttr.writable = True
+
+        cls.time_group = cAttr.create("time_group", "tg")
+        cAttr.addChild(cls.time_label)
+        cAttr.addChild(cls.time_enable)
+        cAttr.addChild(cls.time_script)
+        cAttr.addChild(cls.time_inputs)
+        cAttr.addChild(cls.time_outputs)
+        cAttr.addChild(cls.time_memo)
+        cAttr.array = True
 
         cls.addAttribute(cls.sync_group)
         cls.addAttribute(cls.listen_group)
-        # TODO selection change callback
+        cls.addAttribute(cls.select_group)
+        cls.addAttribute(cls.time_group)
+
+        for attr in (cls.input_values, cls.script, cls.enable, cls.mode):
+            cls.attributeAffects(attr, cls.output_values)
 
     def __init__(self):
         super(CallbackNodeBase, self).__init__()
         self.is_connection_made = False
         self.is_connection_broken = False
-        self.callback_ids = OpenMaya.MCallbackIdArray()
-
-    def on_script_changed(self, plug, cache, module_name="__CallbackCache[{i}]__"):
+        self.callback_ids = []
+        self.handle = None
+        self.suspended = False
+        # NOTE created by a file read, set up once by the rebuild pass after loading
+        self.is_loading = LOADER.is_loading
+        # NOTE unique per instance so that module of different nodes never collide
+        self.cache_id = next(CallbackNodeBase.counter)
+
+    def is_alive(self):
+        return not self.suspended and bool(self.handle and self.handle.isValid())
+
+    def suspend(self, *args):
+        self.suspended = True
+
+    def resume(self, *args):
+        self.suspended = False
+
+    def on_script_changed(
+        self, plug, cache, module_name="__CallbackCache[{id}].{attr}[{i}]__"
+    ):
         assert isinstance(cache, dict), "wrong type argument"
 
         grp = plug.parent()
         index = grp.logicalIndex()
+        attr = OpenMaya.MFnAttribute(grp.attribute()).name
+        WATCHER.unwatch((self, attr, index))
         script = plug.asString()
         if not script:
+            cache.pop(index, None)
             return
 
-        module_name = module_name.format(i=index)
-
-        envs = os.environ.copy()
-        envs.update({"__file__": __file__, "__dir__": DIR})
-        path = Template(script).substitute(envs)
-        path = os.path.abspath(path)
-        module = None
-        if os.path.isfile(path):
-            module = imp.load_source(module_name, path)
-        elif Util.is_valid_python(script):
-            module = imp.new_module(module_name)
-            six.exec_(script, module.__dict__)
-
-        if module:
-            cache[index] = module
-        else:
+        module_name = module_name.format(id=self.cache_id, attr=attr, i=index)
+        start = PROFILER.enabled and timer()
+
+        # NOTE compile once, every group gets a fresh namespace from the code
+        code, path = SCRIPT_CACHE.load(script)
+        if code is None:
             OpenMaya.MGlobal.displayWarning("`%s` not valid" % plug.name())
+            return
+
+        cache[index] = Util.new_module(code, module_name, path, self)
+        if path:
+            WATCHER.watch(path, (self, attr, index), cache, module_name)
+
+        if start:
+            PROFILER.record(start, self, attr, index, "compile")
+
+
+class PlugView(object):
+    """
+    lazy view of the group plugs, behave like the plug name list for old scripts
+    `plugs` give the raw MPlug, names and values are only read on demand
+    """
+
+    __slots__ = ("plugs", "_names")
+
+    def __init__(self, plugs):
+        self.plugs = plugs
+        self._names = None
+
+    @property
+    def names(self):
+        if self._names is None:
+            self._names = [plug.name() for plug in self.plugs]
+        return self._names
+
+    def name(self, index):
+        if self._names is None:
+            return self.plugs[index].name()
+        return self._names[index]
+
+    def value(self, index):
+        return self.plugs[index].asDouble()
+
+    def values(self):
+        return [plug.asDouble() for plug in self.plugs]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.names[index]
+        return self.name(index)
+
+    def __len__(self):
+        return len(self.plugs)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __add__(self, other):
+        return self.names + list(other)
+
+    def __repr__(self):
+        return repr(self.names)
+
+
+class SyncPayload(dict):
+    """
+    sync callback data, a real dict so that old `__callback__(self, data)` keep working
+    `data["inputs"]` and `data.inputs` are the same PlugView
+    """
+
+    __slots__ = ()
+
+    def __init__(self, inputs, outputs, call_type):
+        super(SyncPayload, self).__init__(
+            inputs=PlugView(inputs), outputs=PlugView(outputs), type=call_type
+        )
+
+    @property
+    def inputs(self):
+        return self["inputs"]
+
+    @property
+    def outputs(self):
+        return self["outputs"]
+
+    @property
+    def type(self):
+        return self["type"]
+
+    def items(self):
+        # NOTE json encode dict subclass through `items`, give it the plug name list
+        return [
+            (key, value.names if isinstance(value, PlugView) else value)
+            for key, value in super(SyncPayload, self).items()
+        ]
+
+
+class ListenFilter(object):
+    """
+    per listened node filter compiled from the `listen_group` element
+    `listen_mask` reject messages, `listen_filter` attribute names or
+    the plug connected to `listen_inputs` reject unrelated attributes
+    """
+
+    __slots__ = ("grp", "plug", "mask", "attrs")
+
+    def __init__(self, grp, plug):
+        self.grp = grp
+        self.plug = plug
+        self.mask = 0
+        self.attrs = None
+
+    def compile(self, names, mask):
+        self.mask = mask
+        self.attrs = None
+
+        node = self.plug.node()
+        if names:
+            fn = OpenMaya.MFnDependencyNode(node)
+            self.attrs = set()
+            for name in names.split():
+                if fn.hasAttribute(name):
+                    self.attrs |= Util.hash_attributes(fn.attribute(name))
+                else:
+                    msg = "`%s` has no attribute `%s`" % (fn.name(), name)
+                    OpenMaya.MGlobal.displayWarning(msg)
+            return
+
+        # NOTE message plug listen the whole node
+        attr = self.plug.attribute()
+        if OpenMaya.MFnAttribute(attr).name != "message":
+            self.attrs = Util.hash_attributes(attr)
+
+    def match(self, msg, plug):
+        if self.mask and not msg & self.mask:
+            return False
+        if self.attrs is not None:
+            return Util.hash_node(plug.attribute()) in self.attrs
+        return True
 
 
 class CallbackNodeSyncMixin(object):
     def __init__(self):
         super(CallbackNodeSyncMixin, self).__init__()
         self.sync_cache = {}
-        self.deffer_flag = set()
+        self.sync_plugs = {}
+        # NOTE group index -> input values fingerprint of the last run
+        self.sync_fingerprints = {}
+
+    def get_sync_plugs(self, grp):
+        """
+        resolved `(inputs, outputs)` source plugs of the group
+        rebuild only when the connected element count changed
+        """
+        index = grp.logicalIndex()
+        inputs_plug = grp.child(self.inputs)
+        outputs_plug = grp.child(self.outputs)
+        count = (
+            inputs_plug.numConnectedElements(),
+            outputs_plug.numConnectedElements(),
+        )
+        cache = self.sync_plugs.get(index)
+        if cache is None or cache[0] != count:
+            inputs = Util.get_array_element(inputs_plug)
+            outputs = Util.get_array_element(outputs_plug)
+            cache = self.sync_plugs[index] = (count, inputs, outputs)
+        return cache[1], cache[2]
 
     def eval_sync_grp(self, plug, call_type):
+        start = PROFILER.enabled and timer()
         grp = plug.array().parent()
+        index = grp.logicalIndex()
+        if self.run_sync_grp(grp, call_type):
+            # NOTE defer run so that sync the value properly
+            SCHEDULER.schedule(self, index, call_type)
+        if start:
+            PROFILER.record(start, self, "sync_group", index)
+
+    def eval_sync_deferred(self, index, call_type):
+        start = PROFILER.enabled and timer()
+        grp = OpenMaya.MPlug(self.thisMObject(), self.sync_group)
+        self.run_sync_grp(grp.elementByLogicalIndex(index), call_type, True)
+        if start:
+            PROFILER.record(start, self, "sync_group", index, "deferred")
+
+    def run_sync_grp(self, grp, call_type, is_deferred=False):
         index = grp.logicalIndex()
         is_enable = grp.child(self.enable).asBool()
         if not is_enable:
-            return
+            return False
 
-        module = self.sync_cache.get(index)
-        scirpt_plug_name = grp.child(self.script).name()
-        callback = getattr(module, CALLBACK_NAME, None)
+        # NOTE connection changed, resolve the plugs again
+        if call_type != "eval":
+            self.sync_plugs.pop(index, None)
 
-        inputs = Util.get_array_element(grp.child(self.inputs))
-        outputs = Util.get_array_element(grp.child(self.outputs))
+        mode = grp.child(self.mode).asShort()
+        # NOTE evaluated by the DG through `compute`
+        if mode == MODE_COMPUTE:
+            return False
+
+        module = self.sync_cache.get(index)
+        inputs, outputs = self.get_sync_plugs(grp)
 
         try:
-            assert module, "`%s` not valid" % scirpt_plug_name
-            assert callable(callback), "`%s` -> `%s` method not exists" % (
-                scirpt_plug_name,
-                CALLBACK_NAME,
-            )
+            scirpt_plug = grp.child(self.script)
+            if mode == MODE_TRANSFER:
+                # NOTE script is optional, plain copy without transfer function
+                callback = getattr(module, TRANSFER_NAME, None)
+                assert callback is None or callable(callback), (
+                    "`%s` -> `%s` is not callable" % (scirpt_plug.name(), TRANSFER_NAME)
+                )
+            elif mode == MODE_ASYNC:
+                callback = getattr(module, TRANSFER_NAME, None)
+                assert module, "`%s` not valid" % scirpt_plug.name()
+                assert callable(callback), "`%s` -> `%s` method not exists" % (
+                    scirpt_plug.name(),
+                    TRANSFER_NAME,
+                )
+            else:
+                callback = getattr(module, CALLBACK_NAME, None)
+                assert module, "`%s` not valid" % scirpt_plug.name()
+                assert callable(callback), "`%s` -> `%s` method not exists" % (
+                    scirpt_plug.name(),
+                    CALLBACK_NAME,
+                )
             assert inputs, "`%s` is empty" % grp.child(self.inputs).name()
             assert outputs, "`%s` is empty" % grp.child(self.outputs).name()
 
@@ -218,93 +1664,341 @@ class CallbackNodeSyncMixin(object):
             is_eval = call_type == "eval"
             if is_eval:
                 OpenMaya.MGlobal.displayWarning(str(e))
-            return
+            return False
 
-        data = {}
-        data["inputs"] = [i.name() for i in inputs]
-        data["outputs"] = [o.name() for o in outputs]
-        data["type"] = call_type
-
-        # NOTE ignore undo run callback
-        callback = Util.ignore_undo_deco(callback)
-
-        # TODO callback dead loop detect
-        callback(self, data)
-        # NOTE defer run so that sync the value properly
-        if not self.deffer_flag:
-            self.deffer_flag.add(1)
-            cmds.evalDeferred(
-                # NOTE exists check so that delete will perform correctly
-                lambda p=plug.name(): (
-                    cmds.objExists(p) and callback(self, data),
-                    self.deffer_flag.clear(),
-                )
-            )
+        is_skip_unchanged = grp.child(self.skip_unchanged).asBool()
+        if is_skip_unchanged:
+            fingerprint = Util.fingerprint(inputs)
+            last = self.sync_fingerprints.get(index)
+            if call_type == "eval" and fingerprint is not None and fingerprint == last:
+                field = "settled" if is_deferred else "skipped"
+                PROFILER.skip(self, "sync_group", index, field)
+                return False
+
+        # NOTE suppress callback feeding back into its own evaluation
+        if not GUARD.enter(self, "sync_group", index):
+            return False
+
+        try:
+            if mode == MODE_TRANSFER:
+                self.transfer_sync_grp(callback, inputs, outputs)
+            elif mode == MODE_ASYNC:
+                RUNNER.submit(self, index, callback, inputs, outputs)
+            else:
+                data = SyncPayload(inputs, outputs, call_type)
+                # NOTE ignore undo run callback
+                with IGNORE_UNDO:
+                    callback(self, data)
+            # NOTE values count as applied only once the callback went through
+            if is_skip_unchanged:
+                self.sync_fingerprints[index] = fingerprint
+        finally:
+            GUARD.exit()
+        # NOTE async result is written back on the main thread, a deferred pass
+        # would only submit the same snapshot again
+        return mode != MODE_ASYNC
+
+    def compute_sync_grp(self, plug, data):
+        """
+        `compute` mode evaluate `output_values` from `input_values` inside the DG,
+        only the data block is touched so that it is safe under the Evaluation Manager
+        """
+        array = plug.array() if plug.isElement else plug
+        index = array.parent().logicalIndex()
+        start = PROFILER.enabled and timer()
+
+        groups = data.inputArrayValue(self.sync_group)
+        groups.jumpToLogicalElement(index)
+        grp = groups.inputValue()
+        inputs = OpenMaya.MArrayDataHandle(grp.child(self.input_values))
+        values = []
+        for i in range(len(inputs)):
+            inputs.jumpToPhysicalElement(i)
+            values.append(inputs.inputValue().asDouble())
+
+        is_enable = grp.child(self.enable).asShort()
+        func = getattr(self.sync_cache.get(index), TRANSFER_NAME, None)
+        if is_enable and grp.child(self.mode).asShort() == MODE_COMPUTE:
+            try:
+                values = func(Util.as_array(values)) if callable(func) else values
+            except Exception as e:
+                name = "%s.sync_group[%s]" % (self.name(), index)
+                OpenMaya.MGlobal.displayWarning("`%s` compute error: %s" % (name, e))
+            else:
+                groups = data.outputArrayValue(self.sync_group)
+                groups.jumpToLogicalElement(index)
+                outputs = OpenMaya.MArrayDataHandle(groups.outputValue().child(self.output_values))
+                builder = outputs.builder()
+                for i, value in enumerate(values):
+                    builder.addElement(i).setDouble(float(value))
+                outputs.set(builder)
+                outputs.setAllClean()
+
+        data.setClean(plug)
+        if start:
+            PROFILER.record(start, self, "sync_group", index, "compute")
+
+    @staticmethod
+    def transfer_sync_grp(func, inputs, outputs):
+        """
+        read every input in one pass, apply the vectorized function on the whole
+        values and write the outputs through a single modifier
+        """
+        values = [plug.asDouble() for plug in inputs]
+        if func:
+            values = func(Util.as_array(values))
+        Util.write_plugs(outputs, values)
 
 
 class CallbackNodeListenMixin(object):
     def __init__(self):
         super(CallbackNodeListenMixin, self).__init__()
         self.listen_cache = {}
-        self.listen_inputs_plugs = nestdict()
-        self.listen_ids = {}
-        self.listen_nodes = defaultdict(list)
+        # NOTE group index -> listened node handle hash -> ListenFilter
+        self.listen_inputs_plugs = defaultdict(dict)
+
+    def on_listen_attr_changed(self, msg, plug, other_plug=None, listener=None):
+        # NOTE reject unrelated message before any callback work
+        if self.suspended or not listener.match(msg, plug):
+            return
+
+        start = PROFILER.enabled and timer()
+        self.run_listen_grp(listener.grp, msg, plug, other_plug)
+        if start:
+            index = listener.grp.logicalIndex()
+            PROFILER.record(start, self, "listen_group", index, "listen")
 
-    def on_listen_attr_changed(self, msg, plug, other_plug=None, grp=None):
+    def run_listen_grp(self, grp, msg, plug, other_plug):
         is_enable = grp.child(self.listen_enable).asBool()
         if not is_enable:
             return
 
         index = grp.logicalIndex()
-        scirpt_plug_name = grp.child(self.listen_script).name()
 
         try:
             module = self.listen_cache.get(index)
-            assert module, "`%s` not valid" % scirpt_plug_name
+            scirpt_plug = grp.child(self.listen_script)
+            assert module, "`%s` not valid" % scirpt_plug.name()
             callback = getattr(module, CALLBACK_NAME, None)
             assert callable(callback), "`%s` -> `%s` method not exists" % (
-                scirpt_plug_name,
+                scirpt_plug.name(),
                 CALLBACK_NAME,
             )
         except AssertionError as e:
             OpenMaya.MGlobal.displayWarning(str(e))
             return
 
-        Util.ignore_undo_deco(callback)(self, msg, plug, other_plug)
+        if not GUARD.enter(self, "listen_group", index):
+            return
+
+        try:
+            with IGNORE_UNDO:
+                callback(self, msg, plug, other_plug)
+        finally:
+            GUARD.exit()
+
+    def on_listen_filter_changed(self, plug):
+        grp = plug.parent()
+        index = grp.logicalIndex()
+        names = grp.child(self.listen_filter).asString()
+        mask = grp.child(self.listen_mask).asInt()
+        for listener in self.listen_inputs_plugs[index].values():
+            listener.compile(names, mask)
 
     def on_listen_connect(self, plug, other_plug):
+        if self.is_connection_made:
+            self.listen_connect(plug, other_plug)
+        elif self.is_connection_broken:
+            self.listen_disconnect(plug, other_plug)
+
+    def listen_connect(self, plug, other_plug):
         grp = plug.array().parent()
         index = grp.logicalIndex()
         node = other_plug.node()
-        listen_nodes = self.listen_nodes[index]
-        if self.is_connection_made:
-            if node in listen_nodes:
-                name = OpenMaya.MFnDependencyNode(node).name()
-                OpenMaya.MGlobal.displayWarning("`%s` node already listened" % name)
+        key = Util.hash_node(node)
+        listeners = self.listen_inputs_plugs[index]
+        if key in listeners:
+            # NOTE undo restore the connection, the callback is still registered
+            if listeners[key].plug == other_plug:
                 return
+            name = OpenMaya.MFnDependencyNode(node).name()
+            OpenMaya.MGlobal.displayWarning("`%s` node already listened" % name)
+            return
+
+        listener = ListenFilter(grp, other_plug)
+        names = grp.child(self.listen_filter).asString()
+        listener.compile(names, grp.child(self.listen_mask).asInt())
+        listeners[key] = listener
+        LISTENER.add(self, index, listener)
+
+    def listen_disconnect(self, plug, other_plug):
+        index = plug.array().parent().logicalIndex()
+        key = Util.hash_node(other_plug.node())
+        self.listen_inputs_plugs[index].pop(key, None)
+        LISTENER.remove(self, index, key)
+
+    def remove_listen_callbacks(self):
+        for index, listeners in self.listen_inputs_plugs.items():
+            for key in listeners:
+                LISTENER.remove(self, index, key)
+        self.listen_inputs_plugs.clear()
+
+
+class CallbackNodeSelectMixin(object):
+    def __init__(self):
+        super(CallbackNodeSelectMixin, self).__init__()
+        self.select_cache = {}
+
+    def get_select_grp(self, index):
+        array = OpenMaya.MPlug(self.thisMObject(), self.select_group)
+        return array.elementByLogicalIndex(index)
+
+    def is_select_throttled(self, index):
+        return self.get_select_grp(index).child(self.select_throttle).asBool()
 
-            listen_nodes.append(node)
-            callback_id = OpenMaya.MNodeMessage.addAttributeChangedCallback(
-                node, self.on_listen_attr_changed, grp
+    def on_select_changed(self, index, selected, deselected):
+        start = PROFILER.enabled and timer()
+        self.run_select_grp(self.get_select_grp(index), selected, deselected)
+        if start:
+            PROFILER.record(start, self, "select_group", index, "select")
+
+    def run_select_grp(self, grp, selected, deselected):
+        is_enable = grp.child(self.select_enable).asBool()
+        if not is_enable:
+            return
+
+        index = grp.logicalIndex()
+
+        try:
+            module = self.select_cache.get(index)
+            scirpt_plug = grp.child(self.select_script)
+            assert module, "`%s` not valid" % scirpt_plug.name()
+            callback = getattr(module, CALLBACK_NAME, None)
+            assert callable(callback), "`%s` -> `%s` method not exists" % (
+                scirpt_plug.name(),
+                CALLBACK_NAME,
             )
-            self.listen_ids[index] = callback_id
+        except AssertionError as e:
+            OpenMaya.MGlobal.displayWarning(str(e))
+            return
+
+        if not GUARD.enter(self, "select_group", index):
+            return
+
+        try:
+            with IGNORE_UNDO:
+                callback(self, selected, deselected)
+        finally:
+            GUARD.exit()
+
+    def on_select_connect(self, plug, other_plug):
+        index = plug.array().parent().logicalIndex()
+        if self.is_connection_made:
+            SELECTION.add(self, index, other_plug.node())
         elif self.is_connection_broken:
-            if node in listen_nodes:
-                listen_nodes.remove(node)
-            callback_id = self.listen_ids.get(index)
-            if callback_id is not None:
-                OpenMaya.MMessage.removeCallback(callback_id)
+            SELECTION.remove(self, index, other_plug.node())
 
 
-class CallbackNode(CallbackNodeSyncMixin, CallbackNodeListenMixin, CallbackNodeBase):
-    # NOTES(timmyliang) pymel auto setup this
-    # _name = PLUGIN_NAME
-    # _typeId = OpenMaya.MTypeId(0x00991)
+class CallbackNodeTimeMixin(object):
+    def __init__(self):
+        super(CallbackNodeTimeMixin, self).__init__()
+        self.time_cache = {}
+        # NOTE group index -> (inputs, outputs) / OrderedDict (frame, fingerprint) -> values
+        self.time_plugs = {}
+        self.time_memo_cache = defaultdict(OrderedDict)
+
+    def invalidate_time_grp(self, index):
+        self.time_plugs.pop(index, None)
+        self.time_memo_cache.pop(index, None)
+
+    def update_time_registration(self):
+        # NOTE only groups with a compiled script listen to the time change
+        if self.time_cache:
+            TIME.add(self)
+        else:
+            TIME.remove(self)
 
-    # def __init__(self):
-    #     super(CallbackNode, self).__init__()
+    def on_time_changed(self, frame):
+        array = OpenMaya.MPlug(self.thisMObject(), self.time_group)
+        for index in list(self.time_cache):
+            grp = array.elementByLogicalIndex(index)
+            start = PROFILER.enabled and timer()
+            if self.run_time_grp(grp, frame) and start:
+                PROFILER.record(start, self, "time_group", grp.logicalIndex(), "time")
+
+    def run_time_grp(self, grp, frame):
+        """
+        return True when the python callback run, False when skipped or memoized
+        """
+        is_enable = grp.child(self.time_enable).asBool()
+        if not is_enable:
+            return False
+
+        index = grp.logicalIndex()
+        plugs = self.time_plugs.get(index)
+        if plugs is None:
+            inputs = Util.get_array_element(grp.child(self.time_inputs))
+            outputs = Util.get_array_element(grp.child(self.time_outputs))
+            plugs = self.time_plugs[index] = (inputs, outputs)
+        inputs, outputs = plugs
+
+        key = None
+        memo = self.time_memo_cache[index]
+        if outputs and grp.child(self.time_memo).asBool():
+            fingerprint = Util.fingerprint(inputs)
+            key = None if fingerprint is None else (frame, fingerprint)
+            values = memo.get(key)
+            if values is not None:
+                Util.write_plugs(outputs, values)
+                return False
+
+        try:
+            module = self.time_cache.get(index)
+            scirpt_plug = grp.child(self.time_script)
+            callback = getattr(module, CALLBACK_NAME, None)
+            assert callable(callback), "`%s` -> `%s` method not exists" % (
+                scirpt_plug.name(),
+                CALLBACK_NAME,
+            )
+        except AssertionError as e:
+            OpenMaya.MGlobal.displayWarning(str(e))
+            return False
+
+        if not GUARD.enter(self, "time_group", index):
+            return False
+
+        try:
+            data = SyncPayload(inputs, outputs, "time")
+            data["frame"] = frame
+            with IGNORE_UNDO:
+                callback(self, data)
+        finally:
+            GUARD.exit()
+
+        if key is not None:
+            try:
+                memo[key] = [plug.asDouble() for plug in outputs]
+            except (RuntimeError, TypeError, ValueError):
+                return True
+            if len(memo) > MEMO_SIZE:
+                memo.popitem(last=False)
+        return True
+
+
+class CallbackNode(
+    CallbackNodeSyncMixin,
+    CallbackNodeListenMixin,
+    CallbackNodeSelectMixin,
+    CallbackNodeTimeMixin,
+    CallbackNodeBase,
+):
+    @classmethod
+    def creator(cls):
+        return cls()
 
     def on_attr_changed(self, msg, plug, other_plug=None, data=None):
+        if self.suspended:
+            return
 
         # TODO state no effect
 
@@ -314,31 +2008,192 @@ class CallbackNode(CallbackNodeSyncMixin, CallbackNodeListenMixin, CallbackNodeB
         is_attribute_set = msg & OpenMaya.MNodeMessage.kAttributeSet
 
         attribute = plug.attribute()
+        if msg & OpenMaya.MNodeMessage.kAttributeArrayRemoved:
+            groups = (self.sync_group, self.listen_group, self.select_group, self.time_group)
+            if attribute in groups:
+                return self.evict_group(attribute, plug.logicalIndex())
+        if self.is_loading:
+            # NOTE the attribute is compiled by the rebuild pass after loading
+            watched = (
+                self.script,
+                self.listen_script,
+                self.listen_inputs,
+                self.listen_filter,
+                self.listen_mask,
+                self.select_script,
+                self.select_inputs,
+                self.time_script,
+            )
+            if attribute in watched:
+                LOADER.defer(self)
+            if attribute != self.inputs and attribute != self.outputs:
+                return
+
         if is_attribute_set:
             if attribute == self.script:
+                self.sync_fingerprints.pop(plug.parent().logicalIndex(), None)
                 return self.on_script_changed(plug, self.sync_cache)
+            elif attribute in (self.enable, self.mode, self.skip_unchanged):
+                self.sync_fingerprints.pop(plug.parent().logicalIndex(), None)
             elif attribute == self.listen_script:
                 return self.on_script_changed(plug, self.listen_cache)
+            elif attribute == self.select_script:
+                return self.on_script_changed(plug, self.select_cache)
+            elif attribute == self.time_script:
+                self.invalidate_time_grp(plug.parent().logicalIndex())
+                self.on_script_changed(plug, self.time_cache)
+                return self.update_time_registration()
+            elif attribute == self.listen_filter or attribute == self.listen_mask:
+                return self.on_listen_filter_changed(plug)
         elif self.is_connection_made or self.is_connection_broken:
-            if attribute == self.listen_inputs:
+            if attribute == self.inputs or attribute == self.outputs:
+                self.sync_plugs.pop(plug.array().parent().logicalIndex(), None)
+            elif attribute == self.listen_inputs:
                 self.on_listen_connect(plug, other_plug)
+            elif attribute == self.select_inputs:
+                self.on_select_connect(plug, other_plug)
+            elif attribute == self.time_inputs or attribute == self.time_outputs:
+                self.invalidate_time_grp(plug.array().parent().logicalIndex())
+
+    def rebuild(self):
+        """
+        compile every script and register every listen / select route in one pass
+        """
+        self.is_loading = False
+        this = self.thisMObject()
+        self.remove_listen_callbacks()
+        SELECTION.remove_node(self)
+
+        groups = (
+            (self.sync_group, self.script, self.sync_cache),
+            (self.listen_group, self.listen_script, self.listen_cache),
+            (self.select_group, self.select_script, self.select_cache),
+            (self.time_group, self.time_script, self.time_cache),
+        )
+        for group, script, cache in groups:
+            array = OpenMaya.MPlug(this, group)
+            for i in range(array.numElements()):
+                grp = array.elementByPhysicalIndex(i)
+                self.on_script_changed(grp.child(script), cache)
+
+                if group == self.sync_group:
+                    # NOTE connections made while loading evaluate in one deferred pass
+                    SCHEDULER.schedule(self, grp.logicalIndex(), "make_connection")
+                    continue
+
+                if group == self.time_group:
+                    self.invalidate_time_grp(grp.logicalIndex())
+                    continue
+
+                if group == self.select_group:
+                    inputs = grp.child(self.select_inputs)
+                    for j in range(inputs.numConnectedElements()):
+                        source = inputs.connectionByPhysicalIndex(j).source()
+                        if not source.isNull:
+                            SELECTION.add(self, grp.logicalIndex(), source.node())
+                    continue
+
+                inputs = grp.child(self.listen_inputs)
+                for j in range(inputs.numConnectedElements()):
+                    plug = inputs.connectionByPhysicalIndex(j)
+                    source = plug.source()
+                    if not source.isNull:
+                        self.listen_connect(plug, source)
+        self.update_time_registration()
+
+    def on_script_reloaded(self, attr, index):
+        """
+        results of the former script are stale once the watcher swapped the module
+        """
+        if attr == "sync_group":
+            self.sync_fingerprints.pop(index, None)
+        elif attr == "time_group":
+            self.time_memo_cache.pop(index, None)
 
     def on_node_removed(self, *args):
-        # TODO undo would not rebuild callbacks that make everything undesired
+        # NOTE suspend before the connections break so that undo has nothing to rebuild
+        self.suspend()
+
+    def evict_group(self, group, index):
+        """
+        drop every cache of a removed group element
+        """
+        WATCHER.unwatch((self, OpenMaya.MFnAttribute(group).name, index))
+        if group == self.sync_group:
+            for cache in (self.sync_cache, self.sync_plugs, self.sync_fingerprints):
+                cache.pop(index, None)
+        elif group == self.listen_group:
+            self.listen_cache.pop(index, None)
+            for key in self.listen_inputs_plugs.pop(index, {}):
+                LISTENER.remove(self, index, key)
+        elif group == self.select_group:
+            self.select_cache.pop(index, None)
+            SELECTION.remove_group(self, index)
+        elif group == self.time_group:
+            self.time_cache.pop(index, None)
+            self.invalidate_time_grp(index)
+            self.update_time_registration()
+
+    def on_node_destroyed(self, *args):
+        # NOTE node leave the undo queue, release everything
         OpenMaya.MMessage.removeCallbacks(self.callback_ids)
-        for i in self.listen_ids.keys():
-            OpenMaya.MMessage.removeCallback(i)
+        self.callback_ids = []
+        self.remove_listen_callbacks()
+        SELECTION.remove_node(self)
+        TIME.remove(self)
+        RUNNER.cancel(self)
+        GUARD.forget(self)
+        WATCHER.unwatch_node(self)
+        caches = (
+            self.sync_cache,
+            self.sync_plugs,
+            self.sync_fingerprints,
+            self.listen_cache,
+            self.select_cache,
+            self.time_cache,
+            self.time_plugs,
+            self.time_memo_cache,
+        )
+        for cache in caches:
+            cache.clear()
 
     def postConstructor(self):
         this = self.thisMObject()
+        self.handle = OpenMaya.MObjectHandle(this)
         addAttributeChangedCallback = OpenMaya.MNodeMessage.addAttributeChangedCallback
         addNodePreRemovalCallback = OpenMaya.MNodeMessage.addNodePreRemovalCallback
+        addNodeDestroyedCallback = OpenMaya.MNodeMessage.addNodeDestroyedCallback
         callback_id = addAttributeChangedCallback(this, self.on_attr_changed)
         self.callback_ids.append(callback_id)
         callback_id = addNodePreRemovalCallback(this, self.on_node_removed)
         self.callback_ids.append(callback_id)
+        callback_id = addNodeDestroyedCallback(this, self.on_node_destroyed)
+        self.callback_ids.append(callback_id)
+        if self.is_loading:
+            LOADER.defer(self)
+
+    def propagate_dirty(self, plug):
+        """
+        refresh message attribute, clean the element through the node data block
+        so that the next upstream change dirty it again
+        https://around-the-corner.typepad.com/adn/2012/07/dirtying-a-maya-mplug-for-array-attribute.html
+        """
+        # NOTE API replacement of `cmds.dgdirty(plug.name(), c=1)`, no plug name no command
+        self.forceCache().setClean(plug)
+
+    def compute(self, plug, data):
+        array = plug.array() if plug.isElement else plug
+        if array.attribute() == self.output_values:
+            self.compute_sync_grp(plug, data)
+
+    def schedulingType(self):
+        # NOTE scripts share module state and the GIL, evaluate one CallbackNode at a time
+        return OpenMaya.MPxNode.kGloballySerial
 
     def setDependentsDirty(self, plug, _):
+        if self.suspended:
+            return
+
         # TODO state no effect
 
         attrs = [self.inputs]
@@ -357,27 +2212,48 @@ class CallbackNode(CallbackNodeSyncMixin, CallbackNodeListenMixin, CallbackNodeB
         if attribute not in attrs:
             return
 
-        # NOTE refresh message attribute
-        # NOTE https://around-the-corner.typepad.com/adn/2012/07/dirtying-a-maya-mplug-for-array-attribute.html
-        # cmds.evalDeferred(lambda p=plug.name(): cmds.dgdirty(p, c=1))
-        cmds.dgdirty(plug.name(), c=1)
+        self.propagate_dirty(plug)
+
+        if self.is_loading:
+            return LOADER.defer(self)
 
-        if plug.isElement():
+        if plug.isElement:
             grp = plug.array().parent()
-            if grp == self.sync_group:
+            if grp.attribute() == self.sync_group:
                 self.eval_sync_grp(plug, call_type)
 
 
 # TODO Node UI template
 
 def initializePlugin(mobject):
-    CallbackNode.register(mobject)
-    sys.modules.setdefault("CallbackNode", imp.load_source("CallbackNode", __file__))
+    plugin = OpenMaya.MFnPlugin(mobject, __author__, "1.0.0")
+    plugin.registerNode(
+        PLUGIN_NAME, PLUGIN_ID, CallbackNode.creator, CallbackNode.initialize
+    )
+    plugin.registerCommand(
+        CallbackNodeStats.name, CallbackNodeStats.creator, CallbackNodeStats.syntax
+    )
+    LOADER.register()
+    TRACKER.register()
+    POLICY.register()
+    # NOTE share this module namespace instead of executing the plug-in twice
+    module = ModuleType(PLUGIN_NAME)
+    module.__dict__.update(globals())
+    sys.modules.setdefault(PLUGIN_NAME, module)
 
 
 def uninitializePlugin(mobject):
-    CallbackNode.deregister(mobject)
-    sys.modules.pop("CallbackNode", None)
+    LOADER.deregister()
+    TRACKER.deregister()
+    POLICY.deregister()
+    LISTENER.stop()
+    SELECTION.stop()
+    TIME.stop()
+    RUNNER.stop()
+    plugin = OpenMaya.MFnPlugin(mobject)
+    plugin.deregisterCommand(CallbackNodeStats.name)
+    plugin.deregisterNode(PLUGIN_ID)
+    sys.modules.pop(PLUGIN_NAME, None)
 
 
 if __name__ == "__main__":
@@ -397,14 +2273,12 @@ if __name__ == "__main__":
     cmds.connectAttr(float_constant + ".inFloat", callback_node + ".sg[0].o[0]", f=1)
     code = dedent(
         """
-        import pymel.core as pm
+        from maya import cmds
         def __callback__(self,data):
             inputs = data["inputs"]
             outputs = data["outputs"]
-            src = pm.PyNode(inputs[0])
-            dst = pm.PyNode(outputs[0])
-            val = src.get()
-            dst.set(val)
+            val = cmds.getAttr(inputs[0])
+            cmds.setAttr(outputs[0], val)
         """
     )
     cmds.setAttr(callback_node + ".sg[0].s", code, typ="string")
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+on-disk bytecode cache of the CallbackNode inline scripts
+
+__MAYA_CALLBACK_CACHE_DIR__ | default is empty
+directory of the marshal files, the disk cache is disabled when it is not set
+entries are keyed by the source hash and the python bytecode magic number
+
+pre-warm the cache from the scripts stored in Maya ASCII scenes
+(without Maya, any python matching the Maya interpreter version)
+
+python callback_node_cache.py shot.ma scenes_dir/ --cache-dir D:/callback_cache
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import os
+import re
+import marshal
+import hashlib
+import argparse
+import tempfile
+
+try:
+    from importlib.util import MAGIC_NUMBER
+except ImportError:
+    import imp
+
+    MAGIC_NUMBER = imp.get_magic()
+
+
+ENV_NAME = "__MAYA_CALLBACK_CACHE_DIR__"
+FILENAME = "<string>"
+# NOTE every script attribute short and long name of the CallbackNode groups
+SCRIPT_ATTRS = {
+    "s",
+    "script",
+    "ls",
+    "listen_script",
+    "ss",
+    "select_script",
+    "ts",
+    "time_script",
+}
+SETATTR_REGEX = re.compile(
+    r'^setAttr\s+(?:-\w+\s+(?:on\s+|off\s+|\d+\s+)?)*"\.(?P<attr>[^"]+)"\s+-type\s+"string"\s'
+)
+STRING_REGEX = re.compile(r'"((?:[^"\\]|\\.)*)"')
+ATTR_REGEX = re.compile(r"(\w+)(?:\[\d+\])?$")
+MEL_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+
+def get_cache_dir(cache_dir=None):
+    return cache_dir or os.getenv(ENV_NAME) or None
+
+
+def source_key(source):
+    if not isinstance(source, bytes):
+        source = source.encode("utf-8")
+    return hashlib.sha1(MAGIC_NUMBER + source).hexdigest()
+
+
+def get_path(source, cache_dir):
+    return os.path.join(cache_dir, "%s.marshal" % source_key(source))
+
+
+def load(source, cache_dir=None):
+    """
+    cached code object of the source, None when missing or unreadable
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    if not cache_dir:
+        return None
+    try:
+        with open(get_path(source, cache_dir), "rb") as f:
+            return marshal.load(f)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def dump(source, code, cache_dir=None):
+    """
+    write through a temporary file so that concurrent sessions never read a partial file
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    if not cache_dir:
+        return False
+    temp = None
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        fd, temp = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(code, f)
+        replace = getattr(os, "replace", os.rename)
+        replace(temp, get_path(source, cache_dir))
+    except (IOError, OSError):
+        # NOTE read only directory or another session already wrote the same entry
+        if temp and os.path.exists(temp):
+            os.remove(temp)
+        return False
+    return True
+
+
+def compile_source(source, cache_dir=None):
+    """
+    load the code from the disk cache, compile and store it on a miss
+    raise SyntaxError like `compile`
+    """
+    code = load(source, cache_dir)
+    if code is None:
+        code = compile(source, FILENAME, "exec")
+        dump(source, code, cache_dir)
+    return code
+
+
+def mel_unescape(text):
+    return re.sub(r"\\(.)", lambda m: MEL_ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def iter_statements(path):
+    """
+    yield the MEL statements of a Maya ASCII file, joined across lines
+    """
+    lines = []
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.decode("utf-8", "replace").strip()
+            if not line or line.startswith("//"):
+                continue
+            lines.append(line)
+            # NOTE a statement end with `;` outside of any string
+            if STRING_REGEX.sub("", line).rstrip().endswith(";"):
+                yield " ".join(lines)
+                lines = []
+
+
+def scan_ma(path):
+    """
+    yield every CallbackNode script value stored in the scene
+    """
+    is_callback_node = False
+    for statement in iter_statements(path):
+        if statement.startswith("createNode "):
+            is_callback_node = statement.split()[1].strip('"') == "CallbackNode"
+            continue
+        if not is_callback_node:
+            continue
+        match = SETATTR_REGEX.match(statement)
+        if not match:
+            continue
+        attr = ATTR_REGEX.search(match.group("attr"))
+        if not attr or attr.group(1) not in SCRIPT_ATTRS:
+            continue
+        # NOTE long string is split into `"..." + "..."` by Maya
+        value = statement[match.end() :]
+        yield "".join(mel_unescape(part) for part in STRING_REGEX.findall(value))
+
+
+def iter_scenes(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(".ma"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def prewarm(paths, cache_dir=None):
+    """
+    compile every inline script of the scenes into the disk cache
+    return the counts of `scenes`, `scripts`, `cached`, `compiled` and `invalid`
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    assert cache_dir, "set `%s` or pass a cache directory" % ENV_NAME
+
+    counts = dict.fromkeys(("scenes", "scripts", "cached", "compiled", "invalid"), 0)
+    seen = set()
+    for scene in iter_scenes(paths):
+        counts["scenes"] += 1
+        for source in scan_ma(scene):
+            key = source_key(source)
+            if not source or key in seen:
+                continue
+            seen.add(key)
+            counts["scripts"] += 1
+            if load(source, cache_dir) is not None:
+                counts["cached"] += 1
+                continue
+            try:
+                compile_source(source, cache_dir)
+            except (SyntaxError, ValueError, TypeError):
+                # NOTE file path script or broken source, resolved by the plug-in
+                counts["invalid"] += 1
+                continue
+            counts["compiled"] += 1
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", help=".ma files or directories")
+    parser.add_argument("--cache-dir", default=None, help="default is $%s" % ENV_NAME)
+    options = parser.parse_args(argv)
+    if not get_cache_dir(options.cache_dir):
+        parser.error("set `%s` or pass --cache-dir" % ENV_NAME)
+
+    counts = prewarm(options.paths, options.cache_dir)
+    print(
+        "%(scenes)s scenes, %(scripts)s scripts: %(compiled)s compiled, "
+        "%(cached)s already cached, %(invalid)s skipped" % counts
+    )
+    return counts
+
+
+if __name__ == "__main__":
+    main()
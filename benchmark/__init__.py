@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Headless CallbackNode benchmark
+
+`fakemaya` stand in `maya.cmds` / `maya.api.OpenMaya` with a tiny dependency graph
+so that the plug-in could be loaded and measured on a plain python interpreter
+
+python -m benchmark --help
+"""
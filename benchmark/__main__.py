@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+run the CallbackNode scenarios against the fake Maya layer
+
+python -m benchmark
+python -m benchmark sync listen --nodes 200 --elements 20
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from textwrap import dedent
+
+from benchmark import fakemaya
+
+fakemaya.install()
+
+from maya import cmds  # noqa: E402
+
+DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_DIR = os.path.join(DIR, "CallbackNode")
+PLUGIN = os.path.join(MODULE_DIR, "plug-ins", "CallbackNode.py")
+sys.path.insert(0, os.path.join(MODULE_DIR, "scripts"))
+
+NOOP_SYNC = dedent(
+    """
+    def __callback__(self, data):
+        data["type"]
+    """
+)
+COPY_SYNC = dedent(
+    """
+    from maya import cmds
+    def __callback__(self, data):
+        for src, dst in zip(data["inputs"], data["outputs"]):
+            cmds.setAttr(dst, cmds.getAttr(src))
+    """
+)
+COPY_TIME = dedent(
+    """
+    def __callback__(self, data):
+        for src, dst in zip(data.inputs.plugs, data.outputs.plugs):
+            dst.setDouble(src.asDouble() * data["frame"])
+    """
+)
+NOOP_LISTEN = dedent(
+    """
+    def __callback__(self, msg, plug, other_plug):
+        pass
+    """
+)
+
+
+class Scenario(object):
+    name = ""
+
+    def __init__(self, options):
+        self.options = options
+        self.nodes = []
+
+    def setup(self):
+        pass
+
+    def run(self):
+        """
+        return the operation count
+        """
+        raise NotImplementedError
+
+    def teardown(self):
+        cmds.delete(self.nodes)
+        cmds.flushUndo()
+        fakemaya.SCENE.idle()
+        self.nodes = []
+
+    def create_sync_node(self, elements, script=NOOP_SYNC):
+        node = cmds.createNode("CallbackNode")
+        self.nodes.append(node)
+        sources = []
+        for i in range(elements):
+            src = cmds.createNode("floatConstant")
+            dst = cmds.createNode("floatConstant")
+            self.nodes += [src, dst]
+            sources.append(src)
+            cmds.connectAttr(src + ".outFloat", "%s.sg[0].i[%s]" % (node, i))
+            cmds.connectAttr(dst + ".inFloat", "%s.sg[0].o[%s]" % (node, i))
+        cmds.setAttr(node + ".sg[0].s", script, type="string")
+        return node, sources
+
+
+class SyncScenario(Scenario):
+    """
+    N nodes x M sync elements, dirty one input of every node then idle
+    """
+
+    name = "sync"
+
+    def setup(self):
+        self.sources = []
+        script = COPY_SYNC if self.options.copy else NOOP_SYNC
+        for _ in range(self.options.nodes):
+            node, sources = self.create_sync_node(self.options.elements, script)
+            cmds.setAttr(node + ".sg[0].su", self.options.skip)
+            self.sources.append(sources[0])
+        fakemaya.SCENE.idle()
+
+    def run(self):
+        for i, src in enumerate(self.sources):
+            cmds.setAttr(src + ".inFloat", float(i))
+        fakemaya.SCENE.idle()
+        return len(self.sources)
+
+
+class TransferScenario(SyncScenario):
+    """
+    same as sync but the groups copy values with the built-in transfer mode
+    """
+
+    name = "transfer"
+
+    def setup(self):
+        super(TransferScenario, self).setup()
+        for node in self.nodes:
+            if node.startswith("CallbackNode"):
+                cmds.setAttr(node + ".sg[0].m", 1)
+        fakemaya.SCENE.idle()
+
+
+class ComputeScenario(Scenario):
+    """
+    N nodes x M elements in compute mode, set one input of every node and pull the outputs
+    NOTE the fake layer has no data block cache, every pulled element run compute again
+    """
+
+    name = "compute"
+
+    def setup(self):
+        self.sources = []
+        self.targets = []
+        for _ in range(self.options.nodes):
+            node = cmds.createNode("CallbackNode")
+            self.nodes.append(node)
+            cmds.setAttr(node + ".sg[0].m", 3)
+            for i in range(self.options.elements):
+                src = cmds.createNode("floatConstant")
+                dst = cmds.createNode("floatConstant")
+                self.nodes += [src, dst]
+                cmds.connectAttr(src + ".outFloat", "%s.sg[0].iv[%s]" % (node, i))
+                cmds.connectAttr("%s.sg[0].ov[%s]" % (node, i), dst + ".inFloat")
+                self.targets.append(dst)
+            self.sources.append(src)
+        fakemaya.SCENE.idle()
+
+    def run(self):
+        for i, src in enumerate(self.sources):
+            cmds.setAttr(src + ".inFloat", float(i))
+        for dst in self.targets:
+            cmds.getAttr(dst + ".outFloat")
+        fakemaya.SCENE.idle()
+        return len(self.sources)
+
+
+class DirtyScenario(Scenario):
+    """
+    N nodes x M disabled sync elements, dirty every input to measure the dirty cost
+    """
+
+    name = "dirty"
+
+    def setup(self):
+        self.sources = []
+        for _ in range(self.options.nodes):
+            node, sources = self.create_sync_node(self.options.elements)
+            cmds.setAttr(node + ".sg[0].e", 0)
+            self.sources += sources
+        fakemaya.SCENE.idle()
+
+    def run(self):
+        for src in self.sources:
+            cmds.setAttr(src + ".inFloat", 1.0)
+        fakemaya.SCENE.idle()
+        return len(self.sources)
+
+
+class DirtyLegacyScenario(DirtyScenario):
+    """
+    same as dirty but refresh the message element with the `cmds.dgdirty` round trip
+    """
+
+    name = "dirty_legacy"
+
+    @staticmethod
+    def legacy_propagate_dirty(node, plug):
+        cmds.dgdirty(plug.name(), c=1)
+
+    def setup(self):
+        self.node_class = fakemaya.SCENE.plugins["CallbackNode"].CallbackNode
+        self.propagate_dirty = self.node_class.propagate_dirty
+        self.node_class.propagate_dirty = self.legacy_propagate_dirty
+        super(DirtyLegacyScenario, self).setup()
+
+    def teardown(self):
+        super(DirtyLegacyScenario, self).teardown()
+        self.node_class.propagate_dirty = self.propagate_dirty
+
+
+class ListenScenario(Scenario):
+    """
+    K attributes watched by L listen groups, set every attribute once
+    """
+
+    name = "listen"
+    filtered = False
+
+    def setup(self):
+        node_type = fakemaya.NodeType("benchControl")
+        for i in range(self.options.attrs):
+            node_type.add(fakemaya.Attr("attr%s" % i, "a%s" % i, "double", 0.0))
+        fakemaya.SCENE.types[node_type.name] = node_type
+
+        self.control = cmds.createNode("benchControl")
+        self.nodes.append(self.control)
+        source = ".attr0" if self.filtered else ".message"
+        for _ in range(self.options.listeners):
+            node = cmds.createNode("CallbackNode")
+            self.nodes.append(node)
+            cmds.setAttr(node + ".lg[0].ls", NOOP_LISTEN, type="string")
+            cmds.connectAttr(self.control + source, node + ".lg[0].li[0]")
+        fakemaya.SCENE.idle()
+
+    def run(self):
+        for i in range(self.options.attrs):
+            cmds.setAttr("%s.attr%s" % (self.control, i), float(i))
+        fakemaya.SCENE.idle()
+        return self.options.attrs
+
+
+class ListenFilteredScenario(ListenScenario):
+    """
+    same as listen but only `attr0` is connected, the other events are filtered
+    """
+
+    name = "listen_filtered"
+    filtered = True
+
+
+class TimeScenario(Scenario):
+    """
+    N time groups played back over F frames, looping playback hit the memo
+    """
+
+    name = "time"
+
+    def setup(self):
+        for _ in range(self.options.nodes):
+            node = cmds.createNode("CallbackNode")
+            self.nodes.append(node)
+            for i in range(self.options.elements):
+                src = cmds.createNode("floatConstant")
+                dst = cmds.createNode("floatConstant")
+                self.nodes += [src, dst]
+                cmds.connectAttr(src + ".outFloat", "%s.tg[0].ti[%s]" % (node, i))
+                cmds.connectAttr(dst + ".inFloat", "%s.tg[0].to[%s]" % (node, i))
+            cmds.setAttr(node + ".tg[0].ts", COPY_TIME, type="string")
+            cmds.setAttr(node + ".tg[0].tm", not self.options.no_memo)
+
+    def run(self):
+        for frame in range(1, self.options.frames + 1):
+            cmds.currentTime(frame)
+        return self.options.frames
+
+
+class ScriptScenario(Scenario):
+    """
+    re-set the same script on every node (script storm)
+    """
+
+    name = "script"
+
+    def setup(self):
+        for _ in range(self.options.nodes):
+            self.create_sync_node(1)
+        self.scripts = [n for n in self.nodes if n.startswith("CallbackNode")]
+
+    def run(self):
+        for node in self.scripts:
+            cmds.setAttr(node + ".sg[0].s", NOOP_SYNC, type="string")
+            cmds.setAttr(node + ".lg[0].ls", NOOP_LISTEN, type="string")
+        fakemaya.SCENE.idle()
+        return len(self.scripts)
+
+
+class LoadScenario(Scenario):
+    """
+    rebuild N nodes the way a file open does, attribute by attribute
+    """
+
+    name = "load"
+
+    def run(self):
+        fakemaya.scene_message(fakemaya.MSceneMessage.kBeforeOpen)
+        control = cmds.createNode("transform")
+        self.nodes.append(control)
+        for _ in range(self.options.nodes):
+            node, _ = self.create_sync_node(self.options.elements)
+            cmds.setAttr(node + ".lg[0].ls", NOOP_LISTEN, type="string")
+            cmds.connectAttr(control + ".message", node + ".lg[0].li[0]")
+        fakemaya.scene_message(fakemaya.MSceneMessage.kAfterOpen)
+        fakemaya.SCENE.idle()
+        return self.options.nodes
+
+
+SCENARIOS = [
+    SyncScenario,
+    TransferScenario,
+    ComputeScenario,
+    DirtyScenario,
+    DirtyLegacyScenario,
+    ListenScenario,
+    ListenFilteredScenario,
+    TimeScenario,
+    ScriptScenario,
+    LoadScenario,
+]
+
+
+def measure(scenario, repeat):
+    scenario.setup()
+    ops = 0
+    elapsed = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops += scenario.run()
+        elapsed += time.perf_counter() - start
+        if isinstance(scenario, LoadScenario):
+            scenario.teardown()
+
+    # NOTE allocation pass is separated, tracemalloc slows everything down
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    count = scenario.run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    scenario.teardown()
+
+    return {
+        "scenario": scenario.name,
+        "ops": ops,
+        "seconds": elapsed,
+        "ops/sec": ops / elapsed if elapsed else 0.0,
+        "peak KiB/op": (peak - before) / 1024.0 / max(count, 1),
+        "retained KiB/op": (current - before) / 1024.0 / max(count, 1),
+    }
+
+
+def main(argv=None):
+    names = [s.name for s in SCENARIOS]
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description=__doc__)
+    parser.add_argument("scenarios", nargs="*", help=", ".join(names))
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--elements", type=int, default=10)
+    parser.add_argument("--attrs", type=int, default=60)
+    parser.add_argument("--listeners", type=int, default=12)
+    parser.add_argument("--frames", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--copy", action="store_true", help="sync callback copy values")
+    parser.add_argument("--skip", action="store_true", help="skip unchanged sync inputs")
+    parser.add_argument("--no-memo", action="store_true", help="disable time group memo")
+    parser.add_argument("--json", action="store_true", help="print json result")
+    options = parser.parse_args(argv)
+    unknown = [name for name in options.scenarios if name not in names]
+    if unknown:
+        parser.error("unknown scenario: %s" % ", ".join(unknown))
+
+    cmds.loadPlugin(PLUGIN)
+    results = []
+    for scenario in SCENARIOS:
+        if options.scenarios and scenario.name not in options.scenarios:
+            continue
+        results.append(measure(scenario(options), options.repeat))
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+        return results
+
+    columns = ["scenario", "ops", "seconds", "ops/sec", "peak KiB/op", "retained KiB/op"]
+    print("".join("%-18s" % c for c in columns))
+    for result in results:
+        row = []
+        for column in columns:
+            value = result[column]
+            row.append("%-18.4f" % value if isinstance(value, float) else "%-18s" % value)
+        print("".join(row))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1450 @@
+# -*- coding: utf-8 -*-
+"""
+lightweight stand-in of `maya.cmds`, `maya.api.OpenMaya` and `maya.utils`
+
+only the surface CallbackNode touches is implemented:
+nodes, attributes, array plugs, connections, dirty propagation,
+message callbacks and the evalDeferred queue.
+values are pulled through connections, nothing is cached.
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import os
+import re
+import sys
+import itertools
+import importlib.util
+from types import ModuleType
+from collections import deque
+from collections import Counter
+from collections import OrderedDict
+from collections import defaultdict
+
+
+class Attr(object):
+    def __init__(self, name, short, kind, default=None):
+        self.name = name
+        self.short = short
+        self.kind = kind
+        self.default = default
+        self.array = False
+        self.writable = True
+        self.readable = True
+        self.storable = True
+        self.keyable = False
+        self.hidden = False
+        self.connectable = True
+        self.usesArrayDataBuilder = False
+        self.parent = None
+        self.children = []
+        self.fields = OrderedDict()
+        self.affects = []
+
+    def find(self, name):
+        for child in self.children:
+            if name in (child.name, child.short):
+                return child
+
+    def __repr__(self):
+        return "<Attr %s>" % self.name
+
+
+class NodeType(object):
+    def __init__(self, name, creator=None, derive=None):
+        self.name = name
+        self.creator = creator
+        # NOTE output attribute name -> input attribute name it copies
+        self.derive = derive or {}
+        self.attrs = []
+        self.add(Attr("message", "msg", "message"))
+
+    def add(self, attr):
+        self.attrs.append(attr)
+
+    def find(self, name):
+        for attr in self.attrs:
+            if name in (attr.name, attr.short):
+                return attr
+        # NOTE child attribute could be referenced without its parent
+        for attr in self.attrs:
+            child = attr.find(name)
+            if child:
+                return child
+
+
+class Node(object):
+    def __init__(self, name, node_type):
+        self.name = name
+        self.type = node_type
+        self.values = {}
+        self.elements = defaultdict(set)
+        self.connected = defaultdict(set)
+        self.connected_count = Counter()
+        self.alive = True
+        self.user = None
+
+    def __repr__(self):
+        return "<Node %s>" % self.name
+
+
+def element_prefixes(path):
+    """
+    yield `(array plug path, logical index)` for every element along the path
+    """
+    for i, (attr, index) in enumerate(path):
+        if attr.array and index is not None:
+            yield path[:i] + ((attr, None),), index
+
+
+class Scene(object):
+    def __init__(self):
+        self.types = {}
+        self.plugins = {}
+        self.commands = {}
+        self.reset()
+
+    def reset(self):
+        self.nodes = OrderedDict()
+        self.sources = {}
+        self.destinations = defaultdict(list)
+        self.deferred = deque()
+        self.callbacks = {}
+        self.registry = defaultdict(OrderedDict)
+        self.ids = itertools.count(1)
+        self.names = itertools.count(1)
+        self.messages = []
+        self.undo_state = True
+        self.time = 0.0
+        self.selection = []
+        self.trash = []
+        self.batch = True
+        self.initializing = None
+        self.dirtying = None
+        for name, derive in BUILTIN_TYPES.items():
+            self.types.setdefault(name, make_builtin(name, derive))
+
+    # ---------------------------------------------------------------- callback
+
+    def add_callback(self, key, func, client=None):
+        callback_id = next(self.ids)
+        self.callbacks[callback_id] = key
+        self.registry[key][callback_id] = (func, client)
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        key = self.callbacks.pop(callback_id, None)
+        if key is None:
+            raise RuntimeError("(kFailure): Unexpected Internal Failure")
+        callbacks = self.registry[key]
+        callbacks.pop(callback_id, None)
+        # NOTE node keyed entries would keep destroyed nodes alive
+        if not callbacks:
+            del self.registry[key]
+
+    def emit(self, key, *args):
+        for func, client in list(self.registry.get(key, {}).values()):
+            func(*(args + (client,)))
+
+    # ---------------------------------------------------------------- node
+
+    def create_node(self, type_name, name=None):
+        node_type = self.types[type_name]
+        name = name or "%s%s" % (type_name, next(self.names))
+        node = Node(name, node_type)
+        self.nodes[name] = node
+        if node_type.creator:
+            node.user = node_type.creator()
+            node.user._node = node
+            node.user.postConstructor()
+        self.emit_node_added(node)
+        return node
+
+    def emit_node_added(self, node):
+        obj = MObject(node)
+        self.emit(("nodeAdded", "dependNode"), obj)
+        self.emit(("nodeAdded", node.type.name), obj)
+
+    def delete_node(self, node):
+        obj = MObject(node)
+        self.emit(("preRemoval", node), obj)
+        node.broken = list(self.connections(node))
+        for (src, dst) in node.broken:
+            self.disconnect(src, dst)
+        self.emit(("nodeRemoved", "dependNode"), obj)
+        self.emit(("nodeRemoved", node.type.name), obj)
+        node.alive = False
+        self.nodes.pop(node.name, None)
+        self.trash.append(node)
+
+    def restore_node(self, node):
+        node.alive = True
+        self.nodes[node.name] = node
+        self.trash.remove(node)
+        self.emit_node_added(node)
+        for (src, dst) in getattr(node, "broken", []):
+            if src[0].alive and dst[0].alive:
+                self.connect(src, dst)
+        node.broken = []
+
+    def destroy_node(self, node):
+        self.emit(("destroyed", node))
+        for callback_id, key in list(self.callbacks.items()):
+            if node in key:
+                self.remove_callback(callback_id)
+
+    def connections(self, node):
+        for (dn, dp), (sn, sp) in list(self.sources.items()):
+            if dn is node or sn is node:
+                yield (sn, sp), (dn, dp)
+
+    # ---------------------------------------------------------------- plug
+
+    def parse(self, name):
+        node_name, _, attr_path = name.partition(".")
+        node = self.nodes.get(node_name)
+        if node is None:
+            raise ValueError("No object matches name: %s" % name)
+        path = ()
+        parent = None
+        for token in attr_path.split("."):
+            match = re.match(r"(\w+)(?:\[(\d+)\])?$", token)
+            attr_name, index = match.group(1), match.group(2)
+            attr = parent.find(attr_name) if parent else node.type.find(attr_name)
+            if attr is None:
+                raise ValueError("No object matches name: %s" % name)
+            if attr.parent and not path:
+                path = ((attr.parent, None),)
+            path += ((attr, None if index is None else int(index)),)
+            parent = attr
+        return node, path
+
+    def get_value(self, node, path):
+        source = self.sources.get((node, path))
+        if source:
+            return self.get_value(*source)
+        attr = path[-1][0]
+        derive = node.type.derive.get(attr.name)
+        if derive:
+            return self.get_value(node, path[:-1] + ((node.type.find(derive), None),))
+        if node.user and not attr.writable:
+            return node.user.compute_value(MPlug(node, path))
+        return node.values.get(path, attr.default)
+
+    def set_value(self, node, path, value):
+        node.values[path] = value
+        for prefix, index in element_prefixes(path):
+            node.elements[prefix].add(index)
+        self.emit(("attr", node), MNodeMessage.kAttributeSet, MPlug(node, path), MPlug())
+        self.dirty(node, path)
+
+    def connect(self, src, dst):
+        if dst in self.sources:
+            self.disconnect(self.sources[dst], dst)
+        self.sources[dst] = src
+        self.destinations[src].append(dst)
+        for node, path in (src, dst):
+            for prefix, index in element_prefixes(path):
+                node.elements[prefix].add(index)
+                node.connected_count[prefix, index] += 1
+                node.connected[prefix].add(index)
+        msg = MNodeMessage.kConnectionMade | MNodeMessage.kOtherPlugSet
+        src_plug, dst_plug = MPlug(*src), MPlug(*dst)
+        self.emit(("attr", dst[0]), msg | MNodeMessage.kIncomingDirection, dst_plug, src_plug)
+        self.emit(("attr", src[0]), msg, src_plug, dst_plug)
+        self.dirty(*dst)
+
+    def disconnect(self, src, dst):
+        if self.sources.get(dst) != src:
+            raise RuntimeError("There is no connection to disconnect")
+        msg = MNodeMessage.kConnectionBroken | MNodeMessage.kOtherPlugSet
+        src_plug, dst_plug = MPlug(*src), MPlug(*dst)
+        self.emit(("attr", dst[0]), msg | MNodeMessage.kIncomingDirection, dst_plug, src_plug)
+        self.emit(("attr", src[0]), msg, src_plug, dst_plug)
+        del self.sources[dst]
+        self.destinations[src].remove(dst)
+        for node, path in (src, dst):
+            for prefix, index in element_prefixes(path):
+                node.connected_count[prefix, index] -= 1
+                if not node.connected_count[prefix, index]:
+                    node.connected[prefix].discard(index)
+        self.dirty(*dst)
+
+    def dirty(self, node, path, seen=None):
+        # NOTE a plug already dirtied in this propagation stop it like the DG does
+        if seen is None:
+            if self.dirtying is not None:
+                return self.dirty(node, path, self.dirtying)
+            self.dirtying = seen = set()
+            try:
+                return self.dirty(node, path, seen)
+            finally:
+                self.dirtying = None
+        if (node, path) in seen:
+            return
+        seen.add((node, path))
+        if node.user:
+            array = MPlugArray()
+            node.user.setDependentsDirty(MPlug(node, path), array)
+            for plug in array:
+                self.dirty(plug._node, plug._path, seen)
+        attr = path[-1][0]
+        for affected in attr.affects:
+            self.dirty(node, path[:-1] + ((affected, None),), seen)
+        for output, input_name in node.type.derive.items():
+            if input_name == attr.name:
+                self.dirty(node, path[:-1] + ((node.type.find(output), None),), seen)
+        for dst in list(self.destinations.get((node, path), ())):
+            self.dirty(dst[0], dst[1], seen)
+
+    # ---------------------------------------------------------------- idle
+
+    def idle(self, limit=10000):
+        """
+        run the evalDeferred queue, timer and idle events like Maya does when idling
+        """
+        count = 0
+        for key in [k for k in self.registry if k[0] == "timer"]:
+            for func, client in list(self.registry[key].values()):
+                func(key[1], key[1], client)
+        self.emit(("event", "idle"))
+        while self.deferred and count < limit:
+            func = self.deferred.popleft()
+            func() if callable(func) else exec(func, {})
+            count += 1
+        return count
+
+
+BUILTIN_TYPES = {
+    "floatConstant": {"outFloat": "inFloat"},
+    "transform": {},
+    "network": {},
+}
+
+
+def make_builtin(name, derive):
+    node_type = NodeType(name, derive=derive)
+    if name == "floatConstant":
+        node_type.add(Attr("inFloat", "if", "double", 0.0))
+        node_type.add(Attr("outFloat", "of", "double", 0.0))
+        node_type.attrs[-1].writable = False
+    elif name == "transform":
+        translate = Attr("translate", "t", "compound")
+        for axis in "XYZ":
+            child = Attr("translate" + axis, "t" + axis.lower(), "double", 0.0)
+            child.parent = translate
+            translate.children.append(child)
+        node_type.add(translate)
+        node_type.add(Attr("visibility", "v", "bool", True))
+    return node_type
+
+
+SCENE = Scene()
+
+
+# ============================================================================ OpenMaya
+
+
+class MTypeId(object):
+    def __init__(self, value=0):
+        self._value = value
+
+    def id(self):
+        return self._value
+
+
+class MFn(object):
+    kInvalid = 0
+    kAttribute = 1
+    kCompoundAttribute = 2
+    kNumericAttribute = 3
+    kTypedAttribute = 4
+    kMessageAttribute = 5
+    kEnumAttribute = 6
+    kDependencyNode = 10
+    kPluginDependNode = 11
+
+
+class MObject(object):
+    kNullObj = None
+
+    def __init__(self, obj=None):
+        self._obj = obj._obj if isinstance(obj, MObject) else obj
+
+    def isNull(self):
+        return self._obj is None
+
+    def hasFn(self, fn):
+        obj = self._obj
+        if isinstance(obj, Attr):
+            kinds = {
+                MFn.kCompoundAttribute: ("compound",),
+                MFn.kMessageAttribute: ("message",),
+                MFn.kTypedAttribute: ("string", "data"),
+                MFn.kEnumAttribute: ("enum",),
+                MFn.kNumericAttribute: ("double", "float", "int", "bool"),
+            }
+            return fn == MFn.kAttribute or obj.kind in kinds.get(fn, ())
+        if isinstance(obj, Node):
+            return fn == MFn.kDependencyNode or (
+                fn == MFn.kPluginDependNode and obj.user is not None
+            )
+        return False
+
+    def apiTypeStr(self):
+        return type(self._obj).__name__
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._obj is other._obj
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+MObject.kNullObj = MObject()
+
+
+class MObjectHandle(object):
+    def __init__(self, obj=None):
+        self._obj = obj._obj if isinstance(obj, MObject) else None
+
+    def hashCode(self):
+        return id(self._obj) & 0xFFFFFFFF
+
+    def isValid(self):
+        return self._obj is not None and getattr(self._obj, "alive", True)
+
+    def isAlive(self):
+        return self._obj is not None
+
+    def object(self):
+        return MObject(self._obj)
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectHandle) and self._obj is other._obj
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self.hashCode()
+
+
+class MPlug(object):
+    def __init__(self, node=None, attr=None):
+        if isinstance(node, MPlug):
+            self._node, self._path = node._node, node._path
+            return
+        if isinstance(node, MObject):
+            node = node._obj
+        if isinstance(attr, MObject):
+            chain = []
+            attr = attr._obj
+            while attr is not None:
+                chain.insert(0, (attr, None))
+                attr = attr.parent
+            attr = tuple(chain)
+        self._node = node
+        self._path = attr or ()
+
+    # ------------------------------------------------------------ identity
+
+    @property
+    def isNull(self):
+        return self._node is None
+
+    @property
+    def isArray(self):
+        return self._attr.array and self._path[-1][1] is None
+
+    @property
+    def isElement(self):
+        return self._attr.array and self._path[-1][1] is not None
+
+    @property
+    def isCompound(self):
+        return self._attr.kind == "compound"
+
+    @property
+    def isChild(self):
+        return len(self._path) > 1
+
+    @property
+    def isConnected(self):
+        key = (self._node, self._path)
+        return key in SCENE.sources or bool(SCENE.destinations.get(key))
+
+    @property
+    def isDestination(self):
+        return (self._node, self._path) in SCENE.sources
+
+    @property
+    def isSource(self):
+        return bool(SCENE.destinations.get((self._node, self._path)))
+
+    @property
+    def _attr(self):
+        return self._path[-1][0]
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, MPlug)
+            and self._node is other._node
+            and self._path == other._path
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def node(self):
+        return MObject(self._node)
+
+    def attribute(self):
+        return MObject(self._attr)
+
+    def name(self):
+        return "%s.%s" % (self._node.name, self.partialName(useLongNames=True))
+
+    def partialName(self, includeNodeName=False, useLongNames=False, **_):
+        tokens = []
+        for i, (attr, index) in enumerate(self._path):
+            # NOTE plain compound parent is omitted like `node.translateX`
+            if attr.kind == "compound" and not attr.array and i + 1 < len(self._path):
+                continue
+            token = attr.name if useLongNames else attr.short
+            tokens.append(token if index is None else "%s[%s]" % (token, index))
+        name = ".".join(tokens)
+        return "%s.%s" % (self._node.name, name) if includeNodeName else name
+
+    def info(self):
+        return self.name()
+
+    # ------------------------------------------------------------ hierarchy
+
+    def logicalIndex(self):
+        return self._path[-1][1]
+
+    def array(self):
+        return MPlug(self._node, self._path[:-1] + ((self._attr, None),))
+
+    def parent(self):
+        return MPlug(self._node, self._path[:-1])
+
+    def child(self, attr):
+        if isinstance(attr, int):
+            attr = MObject(self._attr.children[attr])
+        return MPlug(self._node, self._path + ((attr._obj, None),))
+
+    def numChildren(self):
+        return len(self._attr.children)
+
+    def elementByLogicalIndex(self, index):
+        return MPlug(self._node, self._path[:-1] + ((self._attr, index),))
+
+    def getExistingArrayAttributeIndices(self):
+        return sorted(self._node.elements.get(self._path, ()))
+
+    def numElements(self):
+        return len(self._node.elements.get(self._path, ()))
+
+    def elementByPhysicalIndex(self, index):
+        return self.elementByLogicalIndex(self.getExistingArrayAttributeIndices()[index])
+
+    def numConnectedElements(self):
+        return len(self._node.connected.get(self._path, ()))
+
+    def connectionByPhysicalIndex(self, index):
+        indices = sorted(self._node.connected.get(self._path, ()))
+        return self.elementByLogicalIndex(indices[index])
+
+    # ------------------------------------------------------------ connection
+
+    def source(self):
+        source = SCENE.sources.get((self._node, self._path))
+        return MPlug(*source) if source else MPlug()
+
+    def destinations(self):
+        return MPlugArray(MPlug(*d) for d in SCENE.destinations.get((self._node, self._path), ()))
+
+    def connectedTo(self, asDst, asSrc):
+        plugs = MPlugArray()
+        if asDst and self.isDestination:
+            plugs.append(self.source())
+        if asSrc:
+            plugs.extend(self.destinations())
+        return plugs
+
+    # ------------------------------------------------------------ value
+
+    def _get(self):
+        return SCENE.get_value(self._node, self._path)
+
+    def asString(self):
+        return self._get() or ""
+
+    def asBool(self):
+        return bool(self._get())
+
+    def asInt(self):
+        return int(self._get() or 0)
+
+    def asShort(self):
+        return self.asInt()
+
+    def asDouble(self):
+        return float(self._get() or 0.0)
+
+    def asFloat(self):
+        return self.asDouble()
+
+    def asMTime(self):
+        return MTime(self.asDouble())
+
+    def _set(self, value):
+        SCENE.set_value(self._node, self._path, value)
+
+    setString = setBool = setInt = setShort = setDouble = setFloat = _set
+
+
+class MPlugArray(list):
+    pass
+
+
+class MDGModifier(object):
+    def __init__(self):
+        self._ops = []
+
+    def newPlugValueDouble(self, plug, value):
+        self._ops.append((plug._set, (value,)))
+        return self
+
+    newPlugValueFloat = newPlugValueDouble
+
+    def newPlugValueInt(self, plug, value):
+        self._ops.append((plug._set, (value,)))
+        return self
+
+    newPlugValueBool = newPlugValueString = newPlugValueInt
+
+    def connect(self, src, dst):
+        self._ops.append((SCENE.connect, ((src._node, src._path), (dst._node, dst._path))))
+        return self
+
+    def doIt(self):
+        ops, self._ops = self._ops, []
+        for func, args in ops:
+            func(*args)
+
+    def undoIt(self):
+        pass
+
+
+class MTime(object):
+    kFilm = 6
+
+    def __init__(self, value=0.0, unit=None):
+        self.value = value
+        self.unit = unit or MTime.kFilm
+
+    def asUnits(self, unit=None):
+        return self.value
+
+
+class MSelectionList(object):
+    def __init__(self, items=None):
+        self._items = list(items or [])
+
+    def add(self, item):
+        node = item._obj if isinstance(item, MObject) else SCENE.nodes[item]
+        if node not in self._items:
+            self._items.append(node)
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def getDependNode(self, index):
+        return MObject(self._items[index])
+
+    def clear(self):
+        self._items = []
+        return self
+
+
+class MGlobal(object):
+    kInteractive = 0
+    kBatch = 1
+
+    @staticmethod
+    def displayWarning(msg):
+        SCENE.messages.append(("warning", msg))
+        if os.getenv("FAKEMAYA_VERBOSE"):
+            print("# Warning: %s" % msg)
+
+    @staticmethod
+    def displayInfo(msg):
+        SCENE.messages.append(("info", msg))
+
+    @staticmethod
+    def displayError(msg):
+        SCENE.messages.append(("error", msg))
+        if os.getenv("FAKEMAYA_VERBOSE"):
+            print("# Error: %s" % msg)
+
+    @staticmethod
+    def getActiveSelectionList():
+        return MSelectionList(SCENE.selection)
+
+    @staticmethod
+    def mayaState():
+        return MGlobal.kBatch if SCENE.batch else MGlobal.kInteractive
+
+
+# ---------------------------------------------------------------- message
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id):
+        SCENE.remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            SCENE.remove_callback(callback_id)
+
+
+class MNodeMessage(MMessage):
+    kConnectionMade = 0x01
+    kConnectionBroken = 0x02
+    kAttributeEval = 0x04
+    kAttributeSet = 0x08
+    kAttributeLocked = 0x10
+    kAttributeUnlocked = 0x20
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+    kAttributeRenamed = 0x100
+    kAttributeKeyable = 0x200
+    kAttributeUnkeyable = 0x400
+    kIncomingDirection = 0x800
+    kAttributeArrayAdded = 0x1000
+    kAttributeArrayRemoved = 0x2000
+    kOtherPlugSet = 0x4000
+    kLast = 0x8000
+
+    @staticmethod
+    def addAttributeChangedCallback(node, func, clientData=None):
+        return SCENE.add_callback(("attr", node._obj), func, clientData)
+
+    @staticmethod
+    def addNodePreRemovalCallback(node, func, clientData=None):
+        return SCENE.add_callback(("preRemoval", node._obj), func, clientData)
+
+    @staticmethod
+    def addNodeDestroyedCallback(node, func, clientData=None):
+        return SCENE.add_callback(("destroyed", node._obj), func, clientData)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeAddedCallback(func, nodeType="dependNode", clientData=None):
+        return SCENE.add_callback(("nodeAdded", nodeType), func, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(func, nodeType="dependNode", clientData=None):
+        return SCENE.add_callback(("nodeRemoved", nodeType), func, clientData)
+
+    @staticmethod
+    def addTimeChangeCallback(func, clientData=None):
+        return SCENE.add_callback(("time",), func, clientData)
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 1
+    kAfterNew = 2
+    kBeforeImport = 3
+    kAfterImport = 4
+    kBeforeOpen = 5
+    kAfterOpen = 6
+    kBeforeExport = 8
+    kAfterExport = 9
+    kBeforeSave = 10
+    kAfterSave = 11
+    kBeforeCreateReference = 12
+    kAfterCreateReference = 13
+    kBeforeLoadReference = 20
+    kAfterLoadReference = 21
+    kBeforeImportReference = 26
+    kAfterImportReference = 27
+    kMayaExiting = 31
+
+    @staticmethod
+    def addCallback(msg, func, clientData=None):
+        return SCENE.add_callback(("scene", msg), func, clientData)
+
+
+class MEventMessage(MMessage):
+    @staticmethod
+    def addEventCallback(event, func, clientData=None):
+        return SCENE.add_callback(("event", event), func, clientData)
+
+
+class MTimerMessage(MMessage):
+    @staticmethod
+    def addTimerCallback(period, func, clientData=None):
+        return SCENE.add_callback(("timer", period), func, clientData)
+
+
+# ---------------------------------------------------------------- function set
+
+
+class MFnBase(object):
+    pass
+
+
+class MFnDependencyNode(MFnBase):
+    def __init__(self, obj=None):
+        self._node = obj._obj if isinstance(obj, MObject) else None
+
+    def name(self):
+        return self._node.name
+
+    @property
+    def typeName(self):
+        return self._node.type.name
+
+    @property
+    def isFromReferencedFile(self):
+        return False
+
+    def hasAttribute(self, name):
+        return self._node.type.find(name) is not None
+
+    def attribute(self, name):
+        return MObject(self._node.type.find(name))
+
+    def findPlug(self, attr, wantNetworkedPlug=True):
+        if not isinstance(attr, MObject):
+            attr = self.attribute(attr)
+        return MPlug(self._node, attr)
+
+    def userNode(self):
+        return self._node.user
+
+
+class MFnAttribute(MFnBase):
+    _forward = (
+        "array",
+        "writable",
+        "readable",
+        "storable",
+        "keyable",
+        "hidden",
+        "connectable",
+        "usesArrayDataBuilder",
+    )
+
+    def __init__(self, obj=None):
+        object.__setattr__(self, "_attr", obj._obj if isinstance(obj, MObject) else None)
+
+    def __getattr__(self, name):
+        if name in MFnAttribute._forward:
+            return getattr(self._attr, name)
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in MFnAttribute._forward:
+            return setattr(self._attr, name, value)
+        object.__setattr__(self, name, value)
+
+    @property
+    def name(self):
+        return self._attr.name
+
+    @property
+    def shortName(self):
+        return self._attr.short
+
+    @property
+    def parent(self):
+        return MObject(self._attr.parent)
+
+    def _create(self, name, short, kind, default=None):
+        object.__setattr__(self, "_attr", Attr(name, short, kind, default))
+        return MObject(self._attr)
+
+
+class MFnData(object):
+    kInvalid = 0
+    kNumeric = 1
+    kString = 4
+    kDoubleArray = 7
+
+
+class MFnNumericData(object):
+    kInvalid = 0
+    kBoolean = 1
+    kShort = 4
+    kInt = 7
+    kLong = 7
+    kFloat = 10
+    kDouble = 11
+
+
+class MFnMessageAttribute(MFnAttribute):
+    def create(self, name, short):
+        return self._create(name, short, "message")
+
+
+class MFnTypedAttribute(MFnAttribute):
+    def create(self, name, short, data_type, default=None):
+        kind = "string" if data_type == MFnData.kString else "data"
+        return self._create(name, short, kind, "" if kind == "string" else None)
+
+
+class MFnNumericAttribute(MFnAttribute):
+    def create(self, name, short, data_type, default=0):
+        kinds = {
+            MFnNumericData.kBoolean: "bool",
+            MFnNumericData.kShort: "int",
+            MFnNumericData.kInt: "int",
+            MFnNumericData.kFloat: "float",
+            MFnNumericData.kDouble: "double",
+        }
+        return self._create(name, short, kinds[data_type], default)
+
+
+class MFnEnumAttribute(MFnAttribute):
+    def create(self, name, short, default=0):
+        return self._create(name, short, "enum", default)
+
+    def addField(self, name, value):
+        self._attr.fields[name] = value
+
+
+class MFnCompoundAttribute(MFnAttribute):
+    def create(self, name, short):
+        return self._create(name, short, "compound")
+
+    def addChild(self, attr):
+        attr._obj.parent = self._attr
+        self._attr.children.append(attr._obj)
+
+    def numChildren(self):
+        return len(self._attr.children)
+
+    def child(self, index):
+        return MObject(self._attr.children[index])
+
+
+# ---------------------------------------------------------------- proxy
+
+
+class MPxNode(object):
+    kDependNode = 0
+    kDefaultScheduleType = 0
+    kParallel = 1
+    kSerial = 2
+    kGloballySerial = 3
+    kUntrusted = 4
+
+    def __init__(self):
+        self._node = None
+
+    def thisMObject(self):
+        return MObject(self._node)
+
+    def name(self):
+        return self._node.name
+
+    def typeId(self):
+        return MTypeId()
+
+    def postConstructor(self):
+        pass
+
+    def setDependentsDirty(self, plug, plugArray):
+        pass
+
+    def forceCache(self, ctx=None):
+        return MDataBlock(self._node)
+
+    def compute(self, plug, dataBlock):
+        return None
+
+    def compute_value(self, plug):
+        """
+        NOTE not Maya API, pull an output value through compute
+        """
+        block = MDataBlock(self._node)
+        self.compute(plug, block)
+        return self._node.values.get(plug._path, plug._attr.default)
+
+    def schedulingType(self):
+        return MPxNode.kDefaultScheduleType
+
+    @staticmethod
+    def addAttribute(attr):
+        SCENE.initializing.add(attr._obj)
+
+    @staticmethod
+    def attributeAffects(when_changes, is_affected):
+        when_changes._obj.affects.append(is_affected._obj)
+
+
+class MDataBlock(object):
+    def __init__(self, node):
+        self._node = node
+
+    def inputValue(self, attr):
+        return MDataHandle(self._node, ((attr._obj, None),))
+
+    def inputArrayValue(self, attr):
+        return MArrayDataHandle(self.inputValue(attr))
+
+    outputValue = inputValue
+    outputArrayValue = inputArrayValue
+
+    def setClean(self, plug):
+        pass
+
+
+class MDataHandle(object):
+    """
+    NOTE read through the scene (connections included), write without dirty propagation
+    """
+
+    def __init__(self, node=None, path=(), store=None):
+        self._node = node
+        self._path = path
+        self._store = store
+
+    def child(self, attr):
+        return MDataHandle(self._node, self._path + ((attr._obj, None),))
+
+    def _get(self):
+        return SCENE.get_value(self._node, self._path)
+
+    def asDouble(self):
+        return float(self._get() or 0.0)
+
+    def asShort(self):
+        return int(self._get() or 0)
+
+    asInt = asShort
+
+    def asBool(self):
+        return bool(self._get())
+
+    def setDouble(self, value):
+        if self._store is not None:
+            self._store[self._path[-1][1]] = value
+        else:
+            self._node.values[self._path] = value
+
+    def setClean(self):
+        pass
+
+
+class MArrayDataBuilder(object):
+    def __init__(self, handle):
+        self._handle = handle
+        self.values = OrderedDict()
+
+    def addElement(self, index):
+        path = self._handle._path[:-1] + ((self._handle._path[-1][0], index),)
+        return MDataHandle(self._handle._node, path, self.values)
+
+
+class MArrayDataHandle(object):
+    def __init__(self, handle):
+        self._node = handle._node
+        self._path = handle._path
+        self._index = None
+
+    def _indices(self):
+        return sorted(self._node.elements.get(self._path, ()))
+
+    def __len__(self):
+        return len(self._indices())
+
+    def jumpToLogicalElement(self, index):
+        self._index = index
+
+    def jumpToPhysicalElement(self, index):
+        self._index = self._indices()[index]
+
+    def elementLogicalIndex(self):
+        return self._index
+
+    def inputValue(self):
+        return MDataHandle(self._node, self._path[:-1] + ((self._path[-1][0], self._index),))
+
+    outputValue = inputValue
+
+    def builder(self):
+        return MArrayDataBuilder(self)
+
+    def set(self, builder):
+        attr = self._path[-1][0]
+        elements = self._node.elements[self._path]
+        for index in list(elements):
+            self._node.values.pop(self._path[:-1] + ((attr, index),), None)
+        elements.clear()
+        for index, value in builder.values.items():
+            self._node.values[self._path[:-1] + ((attr, index),)] = value
+            elements.add(index)
+
+    def setAllClean(self):
+        pass
+
+
+class MPxCommand(object):
+    def __init__(self):
+        self._result = None
+
+    def setResult(self, value):
+        self._result = value
+
+    def isUndoable(self):
+        return False
+
+
+class MSyntax(object):
+    kNoArg = 0
+    kBoolean = 1
+    kLong = 2
+    kDouble = 3
+    kString = 4
+
+    def __init__(self):
+        self.flags = {}
+
+    def addFlag(self, short, long, *arg_types):
+        flag = (short, long, arg_types)
+        self.flags[short.lstrip("-")] = self.flags[long.lstrip("-")] = flag
+
+
+class MArgList(dict):
+    pass
+
+
+class MArgParser(object):
+    def __init__(self, syntax, args):
+        self._args = {}
+        for key, value in args.items():
+            short = syntax.flags[key][0]
+            self._args[short] = value if isinstance(value, (list, tuple)) else [value]
+
+    def isFlagSet(self, flag):
+        return flag in self._args
+
+    def flagArgumentBool(self, flag, index):
+        return bool(self._args[flag][index])
+
+    def flagArgumentInt(self, flag, index):
+        return int(self._args[flag][index])
+
+    def flagArgumentDouble(self, flag, index):
+        return float(self._args[flag][index])
+
+    def flagArgumentString(self, flag, index):
+        return str(self._args[flag][index])
+
+
+class MFnPlugin(MFnBase):
+    def __init__(self, obj=None, vendor="", version="", apiVersion="Any"):
+        self._plugin = obj._obj if isinstance(obj, MObject) else None
+
+    def registerNode(self, name, type_id, creator, initializer, node_type=0, classification=None):
+        node_type = SCENE.types[name] = NodeType(name, creator)
+        SCENE.initializing = node_type
+        try:
+            initializer()
+        finally:
+            SCENE.initializing = None
+
+    def deregisterNode(self, type_id):
+        pass
+
+    def registerCommand(self, name, creator, syntax=None):
+        def command(**kwargs):
+            instance = creator()
+            instance.doIt(MArgList(kwargs))
+            return instance._result
+
+        SCENE.commands[name] = command
+
+    def deregisterCommand(self, name):
+        SCENE.commands.pop(name, None)
+
+
+# ============================================================================ cmds
+
+
+def _plug(name):
+    return SCENE.parse(name)
+
+
+def createNode(node_type, name=None, n=None, **_):
+    return SCENE.create_node(node_type, name or n).name
+
+
+def connectAttr(src, dst, f=False, force=False, **_):
+    SCENE.connect(_plug(src), _plug(dst))
+
+
+def disconnectAttr(src, dst, **_):
+    SCENE.disconnect(_plug(src), _plug(dst))
+
+
+def setAttr(name, *values, **kwargs):
+    node, path = _plug(name)
+    SCENE.set_value(node, path, values[0] if len(values) == 1 else values)
+
+
+def getAttr(name, **_):
+    return SCENE.get_value(*_plug(name))
+
+
+def removeMultiInstance(name, b=False, **_):
+    node, path = _plug(name)
+    for src, dst in list(SCENE.connections(node)):
+        for plug_node, plug_path in (src, dst):
+            if plug_node is node and plug_path[: len(path)] == path:
+                SCENE.disconnect(src, dst)
+    prefix = path[:-1] + ((path[-1][0], None),)
+    SCENE.emit(("attr", node), MNodeMessage.kAttributeArrayRemoved, MPlug(node, path), MPlug())
+    node.elements[prefix].discard(path[-1][1])
+    for key in [k for k in node.values if k[: len(path)] == path]:
+        del node.values[key]
+
+
+def objExists(name):
+    try:
+        node, path = _plug(name) if "." in name else (SCENE.nodes[name], None)
+    except (KeyError, ValueError):
+        return False
+    return node.alive
+
+
+def delete(*names, **_):
+    for name in names:
+        if isinstance(name, (list, tuple)):
+            delete(*name)
+            continue
+        SCENE.delete_node(SCENE.nodes[name])
+
+
+def undo(**_):
+    """
+    NOTE only undo the latest node deletion
+    """
+    if SCENE.trash:
+        SCENE.restore_node(SCENE.trash[-1])
+
+
+def flushUndo(**_):
+    trash, SCENE.trash = SCENE.trash, []
+    for node in trash:
+        SCENE.destroy_node(node)
+
+
+def ls(*args, **kwargs):
+    node_type = kwargs.get("type")
+    return [n.name for n in SCENE.nodes.values() if not node_type or n.type.name == node_type]
+
+
+def evalDeferred(command, lp=False, lowestPriority=False, **_):
+    SCENE.deferred.append(command)
+
+
+def undoInfo(q=False, query=False, swf=None, stateWithoutFlush=None, state=None, **_):
+    if q or query:
+        return SCENE.undo_state
+    value = swf if swf is not None else stateWithoutFlush
+    if value is not None:
+        SCENE.undo_state = bool(value)
+
+
+def about(batch=False, q=False, **_):
+    if batch:
+        return SCENE.batch
+    return "fakemaya"
+
+
+def dgdirty(*names, **kwargs):
+    plugs = [_plug(name) for name in names]
+    # NOTE dirty state is not simulated, cleaning a plug is a no-op
+    if kwargs.get("c") or kwargs.get("clean"):
+        return
+    for plug in plugs:
+        SCENE.dirty(*plug)
+
+
+def currentTime(value=None, q=False, query=False, e=False, edit=False, update=True, **_):
+    if q or query or value is None:
+        return SCENE.time
+    SCENE.time = float(value)
+    SCENE.emit(("time",), MTime(SCENE.time))
+    return SCENE.time
+
+
+def select(*names, **kwargs):
+    if kwargs.get("cl") or kwargs.get("clear"):
+        SCENE.selection = []
+    else:
+        nodes = [SCENE.nodes[n] for n in names]
+        if kwargs.get("add"):
+            SCENE.selection += [n for n in nodes if n not in SCENE.selection]
+        elif kwargs.get("d") or kwargs.get("deselect"):
+            SCENE.selection = [n for n in SCENE.selection if n not in nodes]
+        else:
+            SCENE.selection = nodes
+    SCENE.emit(("event", "SelectionChanged"))
+
+
+def loadPlugin(path, **_):
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location("%s_plugin" % name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    SCENE.plugins[name] = module
+    module.initializePlugin(MObject(module))
+    return [name]
+
+
+def unloadPlugin(name, **_):
+    module = SCENE.plugins.pop(name)
+    module.uninitializePlugin(MObject(module))
+
+
+def pluginInfo(name, q=False, p=False, loaded=False, path=False, **_):
+    module = SCENE.plugins.get(name)
+    if loaded:
+        return module is not None
+    return module.__file__ if module else None
+
+
+def scene_message(msg):
+    """
+    NOTE not Maya API, emit a MSceneMessage like a file operation would
+    """
+    SCENE.emit(("scene", msg))
+
+
+# ============================================================================ install
+
+
+OPENMAYA_NAMES = [
+    "MTypeId",
+    "MFn",
+    "MObject",
+    "MObjectHandle",
+    "MPlug",
+    "MPlugArray",
+    "MDGModifier",
+    "MTime",
+    "MSelectionList",
+    "MGlobal",
+    "MMessage",
+    "MNodeMessage",
+    "MDGMessage",
+    "MSceneMessage",
+    "MEventMessage",
+    "MTimerMessage",
+    "MFnBase",
+    "MFnDependencyNode",
+    "MFnAttribute",
+    "MFnData",
+    "MFnNumericData",
+    "MFnMessageAttribute",
+    "MFnTypedAttribute",
+    "MFnNumericAttribute",
+    "MFnEnumAttribute",
+    "MFnCompoundAttribute",
+    "MPxNode",
+    "MDataBlock",
+    "MDataHandle",
+    "MArrayDataHandle",
+    "MArrayDataBuilder",
+    "MPxCommand",
+    "MSyntax",
+    "MArgList",
+    "MArgParser",
+    "MFnPlugin",
+]
+
+CMDS_NAMES = [
+    "createNode",
+    "connectAttr",
+    "disconnectAttr",
+    "setAttr",
+    "getAttr",
+    "removeMultiInstance",
+    "objExists",
+    "delete",
+    "undo",
+    "flushUndo",
+    "ls",
+    "evalDeferred",
+    "undoInfo",
+    "about",
+    "dgdirty",
+    "currentTime",
+    "select",
+    "loadPlugin",
+    "unloadPlugin",
+    "pluginInfo",
+]
+
+
+class CmdsModule(ModuleType):
+    def __getattr__(self, name):
+        command = SCENE.commands.get(name)
+        if command is None:
+            raise AttributeError("module 'maya.cmds' has no attribute %r" % name)
+        return command
+
+
+def install():
+    """
+    register the fake `maya` package into `sys.modules`
+    """
+    namespace = globals()
+    maya = ModuleType("maya")
+    maya.__path__ = []
+    api = ModuleType("maya.api")
+    api.__path__ = []
+    openmaya = ModuleType("maya.api.OpenMaya")
+    for name in OPENMAYA_NAMES:
+        setattr(openmaya, name, namespace[name])
+
+    cmds = CmdsModule("maya.cmds")
+    for name in CMDS_NAMES:
+        setattr(cmds, name, namespace[name])
+
+    utils = ModuleType("maya.utils")
+    utils.executeDeferred = lambda func, *args: SCENE.deferred.append(
+        lambda: func(*args)
+    )
+    utils.executeInMainThreadWithResult = lambda func, *args: func(*args)
+
+    maya.cmds, maya.api, maya.utils = cmds, api, utils
+    api.OpenMaya = openmaya
+    sys.modules.update(
+        {
+            "maya": maya,
+            "maya.cmds": cmds,
+            "maya.api": api,
+            "maya.api.OpenMaya": openmaya,
+            "maya.utils": utils,
+        }
+    )
+    return maya
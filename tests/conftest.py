@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+behaviour tests of the plug-in against the `benchmark.fakemaya` layer
+
+python -m pytest tests
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import os
+import sys
+
+import pytest
+
+DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_DIR = os.path.join(DIR, "CallbackNode")
+PLUGIN = os.path.join(MODULE_DIR, "plug-ins", "CallbackNode.py")
+sys.path.insert(0, DIR)
+sys.path.insert(0, os.path.join(MODULE_DIR, "scripts"))
+
+from benchmark import fakemaya  # noqa: E402
+
+fakemaya.install()
+
+from maya import cmds  # noqa: E402
+
+
+@pytest.fixture
+def scene():
+    return fakemaya.SCENE
+
+
+@pytest.fixture
+def plugin(scene):
+    """
+    fresh scene and plug-in module (singletons included) for every test
+    """
+    scene.reset()
+    cmds.loadPlugin(PLUGIN)
+    module = scene.plugins["CallbackNode"]
+    yield module
+    cmds.unloadPlugin("CallbackNode")
+    scene.reset()
+
+
+def connect_group(node, group, inputs, outputs, count=1):
+    """
+    return the (sources, targets) floatConstant feeding / fed by the group
+    """
+    sources, targets = [], []
+    for i in range(count):
+        src = cmds.createNode("floatConstant")
+        dst = cmds.createNode("floatConstant")
+        cmds.connectAttr(src + ".outFloat", "%s.%s[0].%s[%s]" % (node, group, inputs, i))
+        cmds.connectAttr(dst + ".inFloat", "%s.%s[0].%s[%s]" % (node, group, outputs, i))
+        sources.append(src)
+        targets.append(dst)
+    return sources, targets
+
+
+def get_user(node):
+    return fakemaya.SCENE.nodes[node].user
+
+
+def create_control(attrs=("a", "b")):
+    """
+    node with plain double attributes to listen / select
+    """
+    node_type = fakemaya.NodeType("testControl")
+    for name in attrs:
+        node_type.add(fakemaya.Attr(name, name, "double", 0.0))
+    fakemaya.SCENE.types[node_type.name] = node_type
+    return cmds.createNode(node_type.name)
+
+
+def create_listen_node(script, source, index=0, element=0):
+    node = cmds.createNode("CallbackNode")
+    cmds.setAttr("%s.lg[%s].ls" % (node, index), script, type="string")
+    cmds.connectAttr(source, "%s.lg[%s].li[%s]" % (node, index, element))
+    return node
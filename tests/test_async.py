@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+import pytest
+from maya import cmds
+
+from conftest import connect_group, get_user
+
+DOUBLE_TRANSFER = dedent(
+    """
+    CALLS = []
+    def __transfer__(values):
+        CALLS.append([float(v) for v in values])
+        return [v * 2 for v in values]
+    """
+)
+FAIL_TRANSFER = dedent(
+    """
+    def __transfer__(values):
+        raise ValueError("broken")
+    """
+)
+
+
+def create_async_node(scene, script=DOUBLE_TRANSFER):
+    node = cmds.createNode("CallbackNode")
+    (src,), (dst,) = connect_group(node, "sg", "i", "o")
+    cmds.setAttr(node + ".sg[0].m", 2)
+    cmds.setAttr(node + ".sg[0].s", script, type="string")
+    scene.idle()
+    return node, src, dst
+
+
+@pytest.mark.parametrize("synchronous", [True, False])
+def test_one_job_per_change(plugin, scene, synchronous):
+    plugin.POLICY.synchronous = synchronous
+    node, src, dst = create_async_node(scene)
+    calls = get_user(node).sync_cache[0].CALLS
+    del calls[:]
+
+    cmds.setAttr(src + ".inFloat", 3.0)
+    plugin.RUNNER.flush()
+    scene.idle()
+
+    assert calls == [[3.0]]
+    assert cmds.getAttr(dst + ".outFloat") == 6.0
+    assert not plugin.RUNNER.is_busy
+
+
+def test_stale_result_dropped(plugin, scene):
+    node, src, dst = create_async_node(scene)
+    runner = plugin.RUNNER
+    key = (get_user(node), 0)
+    runner.generations[key] += 1
+
+    # NOTE result of a superseded generation never reach the outputs
+    runner.results.append((key, runner.generations[key] - 1, [], [9.0], None))
+    runner.apply()
+    assert cmds.getAttr(dst + ".outFloat") == 0.0
+
+
+def test_error_warns(plugin, scene):
+    node, src, dst = create_async_node(scene, FAIL_TRANSFER)
+    del scene.messages[:]
+
+    cmds.setAttr(src + ".inFloat", 3.0)
+    plugin.RUNNER.flush()
+
+    assert [kind for kind, msg in scene.messages if "async error" in msg] == ["warning"]
+    assert cmds.getAttr(dst + ".outFloat") == 0.0
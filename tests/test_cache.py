@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+import callback_node_cache
+
+SCENE = dedent(
+    r"""
+    //Maya ASCII 2022 scene
+    requires maya "2022";
+    createNode transform -n "ctrl";
+        setAttr ".notes" -type "string" "print(1)";
+    createNode CallbackNode -n "CallbackNode1";
+        rename -uid "5F1A";
+        setAttr -s 2 ".sg";
+        setAttr ".sg[0].s" -type "string" "print(\"quote; \\\\ slash\")\nx = 1";
+        setAttr ".sg[0].e" 1;
+        setAttr -k on ".lg[1].ls" -type "string" (
+            "def __callback__(self, *args):\n"
+             + "    return 'a;b'\n");
+        setAttr ".sg[1].script" -type "string" "D:/scripts/$name.py";
+    createNode network -n "other";
+        setAttr ".ts" -type "string" "not a callback";
+    createNode CallbackNode -n "CallbackNode2";
+        setAttr ".tg[0].ts" -type "string" "\tpass";
+    """
+)
+
+
+def write_scene(tmp_path, text=SCENE, name="shot.ma"):
+    path = tmp_path / name
+    path.write_text(text.lstrip())
+    return str(path)
+
+
+def test_scan_ma(tmp_path):
+    scripts = list(callback_node_cache.scan_ma(write_scene(tmp_path)))
+
+    assert scripts == [
+        'print("quote; \\\\ slash")\nx = 1',
+        "def __callback__(self, *args):\n    return 'a;b'\n",
+        "D:/scripts/$name.py",
+        "\tpass",
+    ]
+
+
+def test_iter_statements_join_lines(tmp_path):
+    path = write_scene(tmp_path, 'setAttr ".a" -type "string" (\n"x;"\n + "y");\n')
+
+    assert list(callback_node_cache.iter_statements(path)) == [
+        'setAttr ".a" -type "string" ( "x;" + "y");'
+    ]
+
+
+def test_prewarm(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    write_scene(tmp_path)
+    write_scene(tmp_path, name="copy.ma")
+
+    counts = callback_node_cache.prewarm([str(tmp_path)], cache_dir)
+    assert counts == {
+        "scenes": 2,
+        "scripts": 4,
+        "cached": 0,
+        "compiled": 2,
+        "invalid": 2,
+    }
+    # NOTE file path and broken sources are left to the plug-in
+    assert callback_node_cache.load("\tpass", cache_dir) is None
+    assert callback_node_cache.load("D:/scripts/$name.py", cache_dir) is None
+
+    counts = callback_node_cache.prewarm([str(tmp_path)], cache_dir)
+    assert counts["cached"] == 2
+    assert counts["compiled"] == 0
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+from maya import cmds
+
+
+DOUBLE_TRANSFER = dedent(
+    """
+    def __transfer__(values):
+        return [v * 2 for v in values]
+    """
+)
+FAIL_TRANSFER = dedent(
+    """
+    def __transfer__(values):
+        raise ValueError("broken")
+    """
+)
+
+
+def create_compute_node(script="", count=2):
+    node = cmds.createNode("CallbackNode")
+    cmds.setAttr(node + ".sg[0].m", 3)
+    cmds.setAttr(node + ".sg[0].s", script, type="string")
+    sources, targets = [], []
+    for i in range(count):
+        src = cmds.createNode("floatConstant")
+        dst = cmds.createNode("floatConstant")
+        # NOTE the DG pull `output_values` into the targets
+        cmds.connectAttr(src + ".outFloat", "%s.sg[0].iv[%s]" % (node, i))
+        cmds.connectAttr("%s.sg[0].ov[%s]" % (node, i), dst + ".inFloat")
+        cmds.setAttr(src + ".inFloat", i + 1.0)
+        sources.append(src)
+        targets.append(dst)
+    return node, sources, targets
+
+
+def test_transfer_in_compute(plugin):
+    node, sources, targets = create_compute_node(DOUBLE_TRANSFER)
+
+    assert [cmds.getAttr(dst + ".outFloat") for dst in targets] == [2.0, 4.0]
+
+    cmds.setAttr(sources[0] + ".inFloat", 5.0)
+    assert cmds.getAttr(targets[0] + ".outFloat") == 10.0
+
+
+def test_copy_without_script(plugin):
+    node, sources, targets = create_compute_node()
+
+    assert [cmds.getAttr(dst + ".outFloat") for dst in targets] == [1.0, 2.0]
+
+
+def test_disabled_group_keep_outputs(plugin):
+    node, sources, targets = create_compute_node(DOUBLE_TRANSFER)
+    cmds.setAttr(node + ".sg[0].e", 0)
+
+    assert [cmds.getAttr(dst + ".outFloat") for dst in targets] == [0.0, 0.0]
+
+
+def test_error_warns(plugin, scene):
+    node, sources, targets = create_compute_node(FAIL_TRANSFER)
+    del scene.messages[:]
+
+    assert cmds.getAttr(targets[0] + ".outFloat") == 0.0
+    assert [kind for kind, msg in scene.messages if "compute error" in msg] == ["warning"]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import pytest
+from maya import cmds
+
+from conftest import PLUGIN
+
+
+@pytest.fixture
+def load(scene, monkeypatch):
+    """
+    load the plug-in with the given environment variables
+    """
+
+    def load(**envs):
+        for name, value in envs.items():
+            monkeypatch.setenv(name, value)
+        scene.reset()
+        cmds.loadPlugin(PLUGIN)
+        return scene.plugins["CallbackNode"]
+
+    yield load
+    if "CallbackNode" in scene.plugins:
+        cmds.unloadPlugin("CallbackNode")
+    scene.reset()
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("1", True), ("true", True), ("ON", True), ("off", False)]
+)
+def test_stats_flag(load, value, expected):
+    plugin = load(__MAYA_CALLBACK_STATS__=value)
+    assert plugin.STATS is expected
+    assert plugin.PROFILER.enabled is expected
+
+
+def test_unknown_flag_keep_default(load, scene):
+    plugin = load(__MAYA_CALLBACK_STATS__="maybe", __MAYA_CALLBACK_SYNC_FLUSH__="bogus")
+    assert plugin.STATS is False
+    # NOTE unknown value fall back to the batch mode detection
+    assert plugin.POLICY.synchronous is scene.batch
+    assert len([m for m in scene.messages if "unknown value" in m[1]]) == 2
+
+
+def test_sync_flush_flag(load):
+    assert load(__MAYA_CALLBACK_SYNC_FLUSH__="no").POLICY.synchronous is False
+
+
+def test_invalid_number_keep_default(load, scene):
+    plugin = load(__MAYA_CALLBACK_MAX_DEPTH__="deep", __MAYA_CALLBACK_WATCH__="0.5")
+    assert plugin.MAX_DEPTH == 16
+    assert plugin.WATCH_INTERVAL == 0.5
+    assert [m for m in scene.messages if "not a number" in m[1]]
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import sys
+from textwrap import dedent
+
+from maya import cmds
+
+from benchmark import fakemaya
+from conftest import connect_group, get_user
+
+COUNT_SYNC = dedent(
+    """
+    from maya import cmds
+    RUNS = []
+    def __callback__(self, data):
+        RUNS.append(data["type"])
+        for src, dst in zip(data["inputs"], data["outputs"]):
+            cmds.setAttr(dst, cmds.getAttr(src))
+    """
+)
+DOUBLE_TIME = dedent(
+    """
+    def __callback__(self, data):
+        for src, dst in zip(data.inputs.plugs, data.outputs.plugs):
+            dst.setDouble(src.asDouble() * data["frame"])
+    """
+)
+
+
+def create_sync_node():
+    node = cmds.createNode("CallbackNode")
+    (src,), (dst,) = connect_group(node, "sg", "i", "o")
+    cmds.setAttr(node + ".sg[0].s", COUNT_SYNC, type="string")
+    return node, src, dst
+
+
+def count_flush(plugin, monkeypatch):
+    calls = []
+    flush = plugin.flush
+
+    def counted():
+        calls.append(True)
+        flush()
+
+    monkeypatch.setattr(plugin, "flush", counted)
+    return calls
+
+
+def test_batch_is_synchronous(plugin):
+    assert plugin.POLICY.synchronous
+    assert plugin.TIME.callback_id is not None
+
+
+def test_one_flush_per_frame(plugin, scene, monkeypatch):
+    calls = count_flush(plugin, monkeypatch)
+    cmds.currentTime(1)
+    assert len(calls) == 1
+
+    node = cmds.createNode("CallbackNode")
+    connect_group(node, "tg", "ti", "to")
+    cmds.setAttr(node + ".tg[0].ts", DOUBLE_TIME, type="string")
+    del calls[:]
+    cmds.currentTime(2)
+    assert len(calls) == 1
+
+
+def test_frame_settled_after_time_groups(plugin, scene):
+    """
+    sync group fed by a time group output settle within the same frame
+    """
+    timer = cmds.createNode("CallbackNode")
+    (source,), (middle,) = connect_group(timer, "tg", "ti", "to")
+    cmds.setAttr(timer + ".tg[0].ts", DOUBLE_TIME, type="string")
+    cmds.setAttr(source + ".inFloat", 1.0)
+    node = cmds.createNode("CallbackNode")
+    dst = cmds.createNode("floatConstant")
+    cmds.connectAttr(middle + ".outFloat", node + ".sg[0].i[0]")
+    cmds.connectAttr(dst + ".inFloat", node + ".sg[0].o[0]")
+    cmds.setAttr(node + ".sg[0].s", COUNT_SYNC, type="string")
+    scene.idle()
+    runs = get_user(node).sync_cache[0].RUNS
+    del runs[:]
+
+    cmds.currentTime(3)
+
+    # NOTE dirty run and deferred pass both happened without any idle
+    assert runs == ["eval", "eval"]
+    assert not plugin.SCHEDULER.pending
+    assert cmds.getAttr(dst + ".outFloat") == 3.0
+
+
+def test_flush_before_save(plugin, scene):
+    node, src, dst = create_sync_node()
+    scene.idle()
+    cmds.setAttr(src + ".inFloat", 2.0)
+    assert plugin.SCHEDULER.pending
+
+    fakemaya.scene_message(fakemaya.MSceneMessage.kBeforeSave)
+    assert not plugin.SCHEDULER.pending
+
+
+def test_flush_after_load(plugin, scene):
+    fakemaya.scene_message(fakemaya.MSceneMessage.kBeforeOpen)
+    node, src, dst = create_sync_node()
+    cmds.setAttr(src + ".inFloat", 2.0)
+    fakemaya.scene_message(fakemaya.MSceneMessage.kAfterOpen)
+
+    assert get_user(node).sync_cache[0].RUNS == ["make_connection"]
+    assert not plugin.SCHEDULER.pending
+    assert cmds.getAttr(dst + ".outFloat") == 2.0
+
+
+def test_public_flush(plugin, scene):
+    plugin.POLICY.synchronous = False
+    node, src, dst = create_sync_node()
+    scene.idle()
+    runs = get_user(node).sync_cache[0].RUNS
+    cmds.setAttr(src + ".inFloat", 2.0)
+    count = len(runs)
+
+    sys.modules["CallbackNode"].flush()
+
+    assert len(runs) == count + 1
+    assert not plugin.SCHEDULER.pending
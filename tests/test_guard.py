@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+from maya import cmds
+
+from conftest import create_control, create_listen_node, get_user
+
+FEEDBACK_LISTEN = dedent(
+    """
+    from maya import cmds
+    from maya.api import OpenMaya
+    RUNS = []
+    def __callback__(self, msg, plug, other_plug):
+        if not msg & OpenMaya.MNodeMessage.kAttributeSet:
+            return
+        RUNS.append(plug.asDouble())
+        cmds.setAttr(plug.name(), plug.asDouble() + 1)
+    """
+)
+COUNT_LISTEN = dedent(
+    """
+    RUNS = []
+    def __callback__(self, msg, plug, other_plug):
+        RUNS.append(msg)
+    """
+)
+
+
+def get_warnings(scene, text):
+    return [msg for kind, msg in scene.messages if kind == "warning" and text in msg]
+
+
+def test_cycle_suppressed(plugin, scene):
+    control = create_control()
+    node = create_listen_node(FEEDBACK_LISTEN, control + ".a")
+    del scene.messages[:]
+
+    cmds.setAttr(control + ".a", 1.0)
+
+    assert get_user(node).listen_cache[0].RUNS == [1.0]
+    assert cmds.getAttr(control + ".a") == 2.0
+    assert len(get_warnings(scene, "callback cycle detected")) == 1
+    assert not plugin.GUARD.stack
+
+
+def test_depth_limit(plugin, scene):
+    plugin.GUARD.max_depth = 2
+    controls = [create_control() for _ in range(4)]
+    nodes = []
+    for source, target in zip(controls, controls[1:]):
+        script = FEEDBACK_LISTEN.replace("plug.name()", "%r" % (target + ".a"))
+        nodes.append(create_listen_node(script, source + ".a"))
+    del scene.messages[:]
+
+    cmds.setAttr(controls[0] + ".a", 1.0)
+
+    runs = [len(get_user(node).listen_cache[0].RUNS) for node in nodes]
+    assert runs == [1, 1, 0]
+    assert len(get_warnings(scene, "callback depth exceed 2")) == 1
+
+
+def test_rate_limit(plugin, scene, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(plugin.time, "time", lambda: now[0])
+    plugin.GUARD.max_rate = 2
+    control = create_control()
+    node = create_listen_node(COUNT_LISTEN, control + ".a")
+    runs = get_user(node).listen_cache[0].RUNS
+    del scene.messages[:]
+
+    for value in range(5):
+        cmds.setAttr(control + ".a", float(value))
+    assert len(runs) == 2
+    assert get_warnings(scene, "callback rate exceed 2 per second")
+
+    # NOTE next second open a new window
+    now[0] += 1
+    cmds.setAttr(control + ".a", 9.0)
+    assert len(runs) == 3
+
+
+def test_destroyed_node_released(plugin, scene):
+    control = create_control()
+    node = create_listen_node(COUNT_LISTEN, control + ".a")
+    cmds.setAttr(control + ".a", 1.0)
+    user = get_user(node)
+    assert any(key[0] is user for key in plugin.GUARD.rates)
+
+    cmds.delete(node)
+    cmds.flushUndo()
+
+    assert not any(key[0] is user for key in plugin.GUARD.rates)
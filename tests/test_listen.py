@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+from maya import cmds
+from maya.api import OpenMaya
+
+from conftest import create_control, create_listen_node, get_user
+
+SET = OpenMaya.MNodeMessage.kAttributeSet
+RECORD_LISTEN = dedent(
+    """
+    EVENTS = []
+    def __callback__(self, msg, plug, other_plug):
+        EVENTS.append((msg, plug.partialName()))
+    """
+)
+
+
+def get_events(node, index=0):
+    return get_user(node).listen_cache[index].EVENTS
+
+
+def create_recorder(source):
+    node = create_listen_node(RECORD_LISTEN, source)
+    # NOTE the listen connection itself is reported on the source side
+    del get_events(node)[:]
+    return node
+
+
+def set_all(control):
+    for name in ("a", "b"):
+        cmds.setAttr("%s.%s" % (control, name), 1.0)
+
+
+def test_message_plug_listen_whole_node(plugin):
+    control = create_control()
+    node = create_recorder(control + ".message")
+    set_all(control)
+
+    assert get_events(node) == [(SET, "a"), (SET, "b")]
+
+
+def test_attribute_plug_listen_only_itself(plugin):
+    control = create_control()
+    node = create_recorder(control + ".a")
+    set_all(control)
+
+    assert get_events(node) == [(SET, "a")]
+
+
+def test_listen_filter(plugin, scene):
+    control = create_control()
+    node = create_recorder(control + ".message")
+    cmds.setAttr(node + ".lg[0].lf", "b", type="string")
+    set_all(control)
+    assert get_events(node) == [(SET, "b")]
+
+    del scene.messages[:]
+    cmds.setAttr(node + ".lg[0].lf", "b missing", type="string")
+    assert [msg for kind, msg in scene.messages if "has no attribute `missing`" in msg]
+
+
+def test_listen_mask(plugin):
+    control = create_control()
+    node = create_recorder(control + ".message")
+    mask = OpenMaya.MNodeMessage.kConnectionMade
+    cmds.setAttr(node + ".lg[0].lm", mask)
+    set_all(control)
+    assert get_events(node) == []
+
+    other = cmds.createNode("floatConstant")
+    cmds.connectAttr(control + ".a", other + ".inFloat")
+    assert [msg & mask for msg, name in get_events(node)] == [mask]
+
+
+def test_group_track_every_listened_node(plugin, scene):
+    first, second = create_control(), create_control()
+    node = create_recorder(first + ".message")
+    cmds.connectAttr(second + ".message", node + ".lg[0].li[1]")
+    del get_events(node)[:]
+    assert len(get_user(node).listen_inputs_plugs[0]) == 2
+
+    cmds.disconnectAttr(first + ".message", node + ".lg[0].li[0]")
+    del get_events(node)[:]
+    set_all(first)
+    set_all(second)
+
+    assert len(get_user(node).listen_inputs_plugs[0]) == 1
+    assert get_events(node) == [(SET, "a"), (SET, "b")]
+
+
+def test_same_node_listened_once_per_group(plugin, scene):
+    control = create_control()
+    node = create_recorder(control + ".message")
+    del scene.messages[:]
+    cmds.connectAttr(control + ".a", node + ".lg[0].li[1]")
+    del get_events(node)[:]
+    set_all(control)
+
+    assert [msg for kind, msg in scene.messages if "already listened" in msg]
+    assert get_events(node) == [(SET, "a"), (SET, "b")]
+
+
+def test_removed_group_stop_listening(plugin):
+    control = create_control()
+    node = create_recorder(control + ".message")
+    cmds.setAttr(node + ".lg[1].ls", RECORD_LISTEN, type="string")
+    cmds.connectAttr(control + ".message", node + ".lg[1].li[0]")
+
+    cmds.removeMultiInstance(node + ".lg[1]", b=True)
+    del get_events(node)[:]
+    set_all(control)
+
+    assert 1 not in get_user(node).listen_inputs_plugs
+    assert get_events(node) == [(SET, "a"), (SET, "b")]
+
+
+def count_attr_callbacks(scene, control):
+    return len(scene.registry.get(("attr", scene.nodes[control]), {}))
+
+
+def test_one_maya_callback_per_listened_node(plugin, scene):
+    control = create_control()
+    nodes = [create_recorder(control + ".message") for _ in range(3)]
+    for node in nodes:
+        del get_events(node)[:]
+    cmds.setAttr(control + ".a", 1.0)
+
+    assert len(plugin.LISTENER.callback_ids) == 1
+    assert count_attr_callbacks(scene, control) == 1
+    assert [get_events(node) for node in nodes] == [[(SET, "a")]] * 3
+
+
+def test_last_subscriber_remove_maya_callback(plugin, scene):
+    control = create_control()
+    first = create_recorder(control + ".message")
+    second = create_recorder(control + ".message")
+
+    cmds.disconnectAttr(control + ".message", first + ".lg[0].li[0]")
+    assert count_attr_callbacks(scene, control) == 1
+    del get_events(second)[:]
+    cmds.setAttr(control + ".a", 1.0)
+    assert get_events(second) == [(SET, "a")]
+
+    cmds.disconnectAttr(control + ".message", second + ".lg[0].li[0]")
+    assert count_attr_callbacks(scene, control) == 0
+    assert not plugin.LISTENER.callback_ids
+    assert not plugin.LISTENER.routes
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import gc
+import json
+
+from maya import cmds
+
+from conftest import get_user
+
+SCRIPT = "def __callback__(self, data):\n    pass\n"
+
+
+def create_node(groups=2):
+    node = cmds.createNode("CallbackNode")
+    for i in range(groups):
+        cmds.setAttr("%s.sg[%s].s" % (node, i), SCRIPT, type="string")
+    return node
+
+
+def get_modules(plugin, node):
+    gc.collect()
+    for item in plugin.cache_report():
+        if item["node"] == node:
+            return item["modules"]
+    return []
+
+
+def test_module_named_per_node(plugin):
+    first, second = create_node(), create_node()
+    modules = get_modules(plugin, first) + get_modules(plugin, second)
+
+    assert len(set(modules)) == 4
+    cache_id = get_user(first).cache_id
+    assert get_user(first).sync_cache[1].__name__ == (
+        "__CallbackCache[%s].sync_group[1]__" % cache_id
+    )
+
+
+def test_removed_group_evicted(plugin):
+    node = create_node()
+    name = get_user(node).sync_cache[1].__name__
+
+    cmds.removeMultiInstance(node + ".sg[1]", b=True)
+
+    assert 1 not in get_user(node).sync_cache
+    assert name not in get_modules(plugin, node)
+    assert len(get_modules(plugin, node)) == 1
+
+
+def test_empty_script_evicted(plugin):
+    node = create_node()
+    cmds.setAttr(node + ".sg[0].s", "", type="string")
+
+    assert 0 not in get_user(node).sync_cache
+    assert len(get_modules(plugin, node)) == 1
+
+
+def test_destroyed_node_release_modules(plugin):
+    node = create_node()
+    cmds.delete(node)
+    cmds.flushUndo()
+    gc.collect()
+
+    assert plugin.cache_report() == []
+
+
+def test_stats_command_cache_flag(plugin):
+    node = create_node(1)
+    report = json.loads(cmds.callbackNodeStats(c=True))
+
+    assert report == [
+        {"node": node, "count": 1, "modules": get_modules(plugin, node)}
+    ]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import json
+from textwrap import dedent
+
+from maya import cmds
+
+from conftest import connect_group, get_user
+
+DICT_SYNC = dedent(
+    """
+    import json
+    RESULT = {}
+    def __callback__(self, data):
+        RESULT["is_dict"] = isinstance(data, dict)
+        RESULT["json"] = json.loads(json.dumps(data))
+        RESULT["inputs"] = data["inputs"]
+        RESULT["values"] = data.inputs.values()
+        RESULT["same"] = data.inputs is data["inputs"]
+        data.update(extra=1)
+        data.setdefault("other", 2)
+        RESULT["pop"] = data.pop("extra")
+        RESULT["copy"] = data.copy()
+        RESULT["keys"] = sorted(data)
+    """
+)
+
+
+def test_payload_is_a_dict(plugin, scene):
+    node = cmds.createNode("CallbackNode")
+    (src,), (dst,) = connect_group(node, "sg", "i", "o")
+    cmds.setAttr(node + ".sg[0].s", DICT_SYNC, type="string")
+    cmds.setAttr(src + ".inFloat", 4.0)
+    scene.idle()
+
+    result = get_user(node).sync_cache[0].RESULT
+    inputs = [src + ".outFloat"]
+    outputs = [dst + ".inFloat"]
+    assert result["is_dict"]
+    assert result["json"] == {"inputs": inputs, "outputs": outputs, "type": "eval"}
+    assert result["inputs"] == inputs
+    assert result["values"] == [4.0]
+    assert result["same"]
+    assert result["pop"] == 1
+    assert result["copy"]["other"] == 2
+    assert result["keys"] == ["inputs", "other", "outputs", "type"]
+
+
+def test_payload_lazy_names(plugin):
+    calls = []
+
+    class Plug(object):
+        def name(self):
+            calls.append(self)
+            return "plug"
+
+    data = plugin.SyncPayload([Plug()], [], "eval")
+    assert data.type == "eval"
+    assert len(data.inputs) == 1
+    assert not calls
+    assert json.dumps(data, sort_keys=True) == (
+        '{"inputs": ["plug"], "outputs": [], "type": "eval"}'
+    )
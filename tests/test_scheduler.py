@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+from maya import cmds
+
+from conftest import get_user
+
+COPY_SYNC = dedent(
+    """
+    from maya import cmds
+    RUNS = []
+    def __callback__(self, data):
+        RUNS.append(data["type"])
+        for src, dst in zip(data["inputs"], data["outputs"]):
+            cmds.setAttr(dst, cmds.getAttr(src))
+    """
+)
+
+
+def create_copy_node(source, target):
+    node = cmds.createNode("CallbackNode")
+    cmds.connectAttr(source + ".outFloat", node + ".sg[0].i[0]")
+    cmds.connectAttr(target + ".inFloat", node + ".sg[0].o[0]")
+    cmds.setAttr(node + ".sg[0].s", COPY_SYNC, type="string")
+    return node
+
+
+def get_runs(node):
+    return get_user(node).sync_cache[0].RUNS
+
+
+def idle_runs(scene, *nodes):
+    """
+    call types of the deferred pass, the dirty itself already run every group once
+    """
+    counts = [len(get_runs(node)) for node in nodes]
+    scene.idle()
+    return [get_runs(node)[count:] for node, count in zip(nodes, counts)]
+
+
+def test_burst_coalesce_into_one_run(plugin, scene):
+    src, dst = cmds.createNode("floatConstant"), cmds.createNode("floatConstant")
+    node = create_copy_node(src, dst)
+    scene.idle()
+
+    for value in (1.0, 2.0, 3.0):
+        cmds.setAttr(src + ".inFloat", value)
+
+    assert idle_runs(scene, node) == [["eval"]]
+    assert cmds.getAttr(dst + ".outFloat") == 3.0
+
+
+def test_connection_change_is_not_replaced_by_eval(plugin, scene):
+    src, dst = cmds.createNode("floatConstant"), cmds.createNode("floatConstant")
+    node = create_copy_node(src, dst)
+    scene.idle()
+
+    other = cmds.createNode("floatConstant")
+    cmds.connectAttr(other + ".outFloat", node + ".sg[0].i[1]")
+    cmds.setAttr(src + ".inFloat", 1.0)
+
+    assert idle_runs(scene, node) == [["make_connection"]]
+
+
+def test_driver_group_runs_first(plugin, scene):
+    """
+    `reader` dirtied first still see the value `driver` wrote in the same pass
+    """
+    src, mid, dst = [cmds.createNode("floatConstant") for _ in range(3)]
+    driver = create_copy_node(src, mid)
+    reader = create_copy_node(mid, dst)
+    scene.idle()
+
+    cmds.setAttr(mid + ".inFloat", 5.0)
+    cmds.setAttr(src + ".inFloat", 7.0)
+
+    # NOTE the write of `driver` run `reader` again on dirty, its deferred run is last
+    assert idle_runs(scene, driver, reader)[0] == ["eval"]
+    assert cmds.getAttr(mid + ".outFloat") == 7.0
+    assert cmds.getAttr(dst + ".outFloat") == 7.0
+    assert plugin.SCHEDULER.sort(
+        [(get_user(reader), 0), (get_user(driver), 0)]
+    ) == [(get_user(driver), 0), (get_user(reader), 0)]
+
+
+def test_cycle_release_every_group_once(plugin, scene):
+    a, b = cmds.createNode("floatConstant"), cmds.createNode("floatConstant")
+    first = create_copy_node(a, b)
+    second = create_copy_node(b, a)
+    scene.idle()
+
+    cmds.setAttr(a + ".inFloat", 1.0)
+    scene.idle()
+
+    # NOTE the deferred pass must not schedule itself again
+    assert not plugin.SCHEDULER.pending
+    assert idle_runs(scene, first, second) == [[], []]
+    keys = [(get_user(first), 0), (get_user(second), 0)]
+    assert plugin.SCHEDULER.sort(keys) == keys
+    assert plugin.SCHEDULER.sort(keys[::-1]) == keys[::-1]
+
+
+def test_deleted_node_is_not_evaluated(plugin, scene):
+    src, dst = cmds.createNode("floatConstant"), cmds.createNode("floatConstant")
+    node = create_copy_node(src, dst)
+    scene.idle()
+    runs = get_runs(node)
+
+    cmds.setAttr(src + ".inFloat", 1.0)
+    count = len(runs)
+    cmds.delete(node)
+    scene.idle()
+
+    assert len(runs) == count
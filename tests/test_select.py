@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+from maya import cmds
+
+from conftest import create_control, get_user
+
+RECORD_SELECT = dedent(
+    """
+    from maya.api import OpenMaya
+    EVENTS = []
+    def __callback__(self, selected, deselected):
+        name = lambda obj: OpenMaya.MFnDependencyNode(obj).name()
+        EVENTS.append(([name(o) for o in selected], [name(o) for o in deselected]))
+    """
+)
+
+
+def create_select_node(*controls, **kwargs):
+    node = cmds.createNode("CallbackNode")
+    cmds.setAttr(node + ".slg[0].ss", RECORD_SELECT, type="string")
+    cmds.setAttr(node + ".slg[0].st", kwargs.get("throttle", False))
+    for i, control in enumerate(controls):
+        cmds.connectAttr(control + ".message", "%s.slg[0].si[%s]" % (node, i))
+    return node
+
+
+def get_events(node):
+    return get_user(node).select_cache[0].EVENTS
+
+
+def test_select_and_deselect(plugin):
+    control, other = create_control(), create_control()
+    node = create_select_node(control)
+
+    cmds.select(control)
+    cmds.select(other)
+    cmds.select(other, control)
+    cmds.select(cl=True)
+
+    assert get_events(node) == [
+        ([control], []),
+        ([], [control]),
+        ([control], []),
+        ([], [control]),
+    ]
+
+
+def test_unwatched_selection_ignored(plugin):
+    control, other = create_control(), create_control()
+    node = create_select_node(control)
+
+    cmds.select(other)
+    cmds.select(cl=True)
+
+    assert get_events(node) == []
+
+
+def test_throttle_report_settled_selection(plugin, scene):
+    first, second = create_control(), create_control()
+    node = create_select_node(first, second, throttle=True)
+
+    cmds.select(first)
+    cmds.select(second)
+    cmds.select(first, second)
+    assert get_events(node) == []
+
+    scene.idle()
+    events = get_events(node)
+    assert len(events) == 1
+    assert sorted(events[0][0]) == sorted([first, second])
+
+
+def test_one_selection_callback(plugin, scene):
+    control = create_control()
+    nodes = [create_select_node(control) for _ in range(3)]
+
+    cmds.select(control)
+
+    assert len(scene.registry[("event", "SelectionChanged")]) == 1
+    assert [get_events(node) for node in nodes] == [[([control], [])]] * 3
+
+
+def test_disconnected_node_not_reported(plugin):
+    control = create_control()
+    node = create_select_node(control)
+    cmds.disconnectAttr(control + ".message", node + ".slg[0].si[0]")
+
+    cmds.select(control)
+
+    assert get_events(node) == []
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+import pytest
+from maya import cmds
+
+from conftest import connect_group, get_user
+
+COPY_SYNC = dedent(
+    """
+    RUNS = []
+    def __callback__(self, data):
+        RUNS.append(data.inputs.values())
+        for src, dst in zip(data.inputs.plugs, data.outputs.plugs):
+            dst.setDouble(src.asDouble())
+    """
+)
+
+
+def create_skip_node(scene):
+    node = cmds.createNode("CallbackNode")
+    (src,), (dst,) = connect_group(node, "sg", "i", "o")
+    cmds.setAttr(node + ".sg[0].s", COPY_SYNC, type="string")
+    cmds.setAttr(node + ".sg[0].su", True)
+    scene.idle()
+    return node, src, dst
+
+
+def test_skip_unchanged_inputs(plugin, scene):
+    node, src, dst = create_skip_node(scene)
+    cmds.setAttr(src + ".inFloat", 1.0)
+    scene.idle()
+    runs = get_user(node).sync_cache[0].RUNS
+    count = len(runs)
+
+    cmds.setAttr(src + ".inFloat", 1.0)
+    scene.idle()
+
+    assert len(runs) == count
+    assert plugin.PROFILER.get_stat(node, "sync_group", 0)["skipped"] == 1
+
+
+def test_skip_count_only_redundant_dirty(plugin, scene):
+    node, src, dst = create_skip_node(scene)
+    for value in (1.0, 2.0, 3.0):
+        cmds.setAttr(src + ".inFloat", value)
+        scene.idle()
+
+    stat = plugin.PROFILER.get_stat(node, "sync_group", 0)
+    assert stat["skipped"] == 0
+    # NOTE every deferred pass found the values its dirty run applied
+    assert stat["settled"] == 3
+    assert cmds.getAttr(dst + ".outFloat") == 3.0
+
+
+def test_skip_unchanged_colliding_hash(plugin, scene):
+    """
+    hash(-1.0) == hash(-2.0), the values must be compared themselves
+    """
+    node, src, dst = create_skip_node(scene)
+    cmds.setAttr(src + ".inFloat", -1.0)
+    scene.idle()
+    cmds.setAttr(src + ".inFloat", -2.0)
+    scene.idle()
+
+    assert cmds.getAttr(dst + ".outFloat") == -2.0
+
+
+def test_skip_unchanged_after_suppressed_run(plugin, scene):
+    node, src, dst = create_skip_node(scene)
+    plugin.GUARD.max_rate = 0
+
+    cmds.setAttr(src + ".inFloat", 5.0)
+    scene.idle()
+    assert cmds.getAttr(dst + ".outFloat") == 0.0
+
+    # NOTE the suppressed value never ran, setting it again must apply it
+    plugin.GUARD.max_rate = 1000
+    cmds.setAttr(src + ".inFloat", 5.0)
+    scene.idle()
+    assert cmds.getAttr(dst + ".outFloat") == 5.0
+
+
+def test_skip_unchanged_after_failed_run(plugin, scene):
+    node, src, dst = create_skip_node(scene)
+    module = get_user(node).sync_cache[0]
+    callback = module.__callback__
+
+    def fail(self, data):
+        raise RuntimeError("failed")
+
+    module.__callback__ = fail
+    with pytest.raises(RuntimeError):
+        cmds.setAttr(src + ".inFloat", 3.0)
+    scene.idle()
+
+    module.__callback__ = callback
+    cmds.setAttr(src + ".inFloat", 3.0)
+    scene.idle()
+    assert cmds.getAttr(dst + ".outFloat") == 3.0
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import os
+
+from maya import cmds
+
+from conftest import connect_group, get_user
+
+SCALE_TIME = """
+RUNS = []
+def __callback__(self, data):
+    RUNS.append(data["frame"])
+    for src, dst in zip(data.inputs.plugs, data.outputs.plugs):
+        dst.setDouble(src.asDouble() * %s)
+"""
+
+
+def create_time_node(script, memo=True):
+    node = cmds.createNode("CallbackNode")
+    (src,), (dst,) = connect_group(node, "tg", "ti", "to")
+    cmds.setAttr(node + ".tg[0].ts", script, type="string")
+    cmds.setAttr(node + ".tg[0].tm", memo)
+    return node, src, dst
+
+
+def test_memo_replay_frame(plugin):
+    node, src, dst = create_time_node(SCALE_TIME % 10)
+    cmds.setAttr(src + ".inFloat", 2.0)
+    for frame in (1, 2, 1, 2):
+        cmds.currentTime(frame)
+
+    assert get_user(node).time_cache[0].RUNS == [1, 2]
+    assert cmds.getAttr(dst + ".outFloat") == 20.0
+
+
+def test_memo_disabled(plugin):
+    node, src, dst = create_time_node(SCALE_TIME % 10, memo=False)
+    for frame in (1, 2, 1):
+        cmds.currentTime(frame)
+
+    assert get_user(node).time_cache[0].RUNS == [1, 2, 1]
+
+
+def test_memo_colliding_hash(plugin):
+    """
+    hash(-1.0) == hash(-2.0), the memo must not serve the other input
+    """
+    node, src, dst = create_time_node(SCALE_TIME % 10)
+    cmds.setAttr(src + ".inFloat", -1.0)
+    cmds.currentTime(1)
+    cmds.currentTime(2)
+    cmds.setAttr(src + ".inFloat", -2.0)
+    cmds.currentTime(1)
+
+    assert cmds.getAttr(dst + ".outFloat") == -20.0
+
+
+def test_memo_dropped_on_reload(plugin, scene, tmp_path):
+    path = str(tmp_path / "scale.py")
+    with open(path, "w") as f:
+        f.write(SCALE_TIME % 1)
+    node, src, dst = create_time_node(path)
+    cmds.setAttr(src + ".inFloat", 2.0)
+    cmds.currentTime(1)
+    cmds.currentTime(2)
+
+    with open(path, "w") as f:
+        f.write(SCALE_TIME % 100)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime + 5, stat.st_mtime + 5))
+    scene.idle()
+    cmds.currentTime(1)
+
+    assert cmds.getAttr(dst + ".outFloat") == 200.0
+
+
+def test_cleared_script_stop_listening(plugin, scene):
+    # NOTE synchronous flush keep the time callback alive on purpose
+    plugin.POLICY.synchronous = False
+    node, src, dst = create_time_node(SCALE_TIME % 10)
+    cmds.currentTime(1)
+    assert get_user(node) in plugin.TIME.nodes
+
+    cmds.setAttr(node + ".tg[0].ts", "", type="string")
+    del scene.messages[:]
+    for frame in (2, 3, 4):
+        cmds.currentTime(frame)
+
+    assert scene.messages == []
+    assert get_user(node) not in plugin.TIME.nodes
+    assert plugin.TIME.callback_id is None
+
+
+def test_group_without_script_is_ignored(plugin, scene):
+    node, src, dst = create_time_node(SCALE_TIME % 10)
+    cmds.connectAttr(src + ".outFloat", node + ".tg[1].ti[0]")
+    cmds.setAttr(src + ".inFloat", 2.0)
+    del scene.messages[:]
+    cmds.currentTime(1)
+
+    assert scene.messages == []
+    assert cmds.getAttr(dst + ".outFloat") == 20.0
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from textwrap import dedent
+
+from maya import cmds
+
+from conftest import connect_group, create_control, create_listen_node, get_user
+
+RECORD_LISTEN = dedent(
+    """
+    EVENTS = []
+    def __callback__(self, msg, plug, other_plug):
+        EVENTS.append(plug.partialName())
+    """
+)
+COPY_SYNC = dedent(
+    """
+    def __callback__(self, data):
+        for src, dst in zip(data.inputs.plugs, data.outputs.plugs):
+            dst.setDouble(src.asDouble())
+    """
+)
+
+
+def create_node(scene):
+    control = create_control()
+    node = create_listen_node(RECORD_LISTEN, control + ".message")
+    (src,), (dst,) = connect_group(node, "sg", "i", "o")
+    cmds.setAttr(node + ".sg[0].s", COPY_SYNC, type="string")
+    scene.idle()
+    user = get_user(node)
+    events = user.listen_cache[0].EVENTS
+    del events[:]
+    return node, user, events, control, src, dst
+
+
+def test_delete_suspend(plugin, scene):
+    node, user, events, control, src, dst = create_node(scene)
+    cmds.delete(node)
+
+    assert user.suspended
+    assert not user.is_alive()
+    cmds.setAttr(control + ".a", 1.0)
+    cmds.setAttr(src + ".inFloat", 1.0)
+    scene.idle()
+    assert events == []
+
+
+def test_undo_resume(plugin, scene):
+    node, user, events, control, src, dst = create_node(scene)
+    cmds.delete(node)
+    cmds.undo()
+
+    assert user.is_alive()
+    # NOTE the restored connection itself is reported
+    del events[:]
+    cmds.setAttr(control + ".a", 1.0)
+    cmds.setAttr(src + ".inFloat", 2.0)
+    scene.idle()
+    assert events == ["a"]
+    assert cmds.getAttr(dst + ".outFloat") == 2.0
+    # NOTE the restored connection reuse the registered listen route
+    assert len(user.listen_inputs_plugs[0]) == 1
+    assert len(plugin.LISTENER.routes) == 1
+
+
+def test_flush_undo_release(plugin, scene):
+    node, user, events, control, src, dst = create_node(scene)
+    cmds.delete(node)
+    cmds.flushUndo()
+
+    assert not plugin.LISTENER.callback_ids
+    assert not user.callback_ids
+    assert not user.sync_cache and not user.listen_cache